@@ -8,6 +8,6 @@ __copyright__ = "3-clause BSD License"
 __version__ = 'dev'
 
 
-from .queens import nb_solutions
+from .queens import nb_solutions, nb_solutions_bitmask, nb_unique_solutions
 
-__all__ = ['nb_solutions']
+__all__ = ['nb_solutions', 'nb_solutions_bitmask', 'nb_unique_solutions']
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# cython: boundscheck=False, wraparound=False
+"""
+Compiled counterpart of the hot loops of :mod:`queens` (boards up to
+63 queens, the masks being held in 64 bits words)
+"""
+
+__author__ = "Begon Jean-Michel <jm.begon@gmail.com>"
+__copyright__ = "3-clause BSD License"
+__version__ = 'dev'
+
+from libc.stdlib cimport calloc, free
+
+ctypedef unsigned long long mask_t
+
+
+cdef mask_t _count(mask_t full, mask_t cols, mask_t diag1,
+                   mask_t diag2) nogil:
+    cdef mask_t avail, bit
+    cdef mask_t nb = 0
+    if cols == full:
+        return 1
+    avail = full & ~(cols | diag1 | diag2)
+    while avail:
+        bit = avail & (~avail + 1)
+        avail ^= bit
+        nb += _count(full, cols | bit, ((diag1 | bit) << 1) & full,
+                     (diag2 | bit) >> 1)
+    return nb
+
+
+def count_bitmask(mask_t full, mask_t cols, mask_t diag1, mask_t diag2):
+    """Count the completions of the partial board described by the masks"""
+    cdef mask_t nb
+    with nogil:
+        nb = _count(full, cols, diag1, diag2)
+    return nb
+
+
+def check_queen(B):
+    """Check whether the N-queens problem is solved or not"""
+    cdef Py_ssize_t N = len(B)
+    cdef Py_ssize_t i
+    cdef long r
+    cdef bint valid = True
+    cdef char* seen = <char*>calloc(5*N + 1, sizeof(char))
+    cdef char* diag1 = seen + N
+    cdef char* diag2 = seen + 3*N
+    if seen == NULL:
+        raise MemoryError()
+    try:
+        for i in range(N):
+            r = B[i]
+            if r < 0 or r >= N or seen[r] or diag1[r - i + N] or diag2[r + i]:
+                valid = False
+                break
+            seen[r] = 1
+            diag1[r - i + N] = 1
+            diag2[r + i] = 1
+    finally:
+        free(seen)
+    return valid
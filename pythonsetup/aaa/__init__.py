@@ -8,7 +8,13 @@ __copyright__ = "3-clause BSD License"
 __version__ = 'dev'
 
 
-from .longestpalindrome import LP, LP_sparse
+from .longestpalindrome import LP, LP_sparse, LP_hirschberg, LP_backpointers
+from .longestpalindrome import LP_diagonal, LP_length, LP_batch
+from .longestpalindrome import LP_contiguous, IncrementalLP, LP_packed
+from .longestpalindrome import LP_banded, encode_word, open_word
 
 
-__all__ = ['LP', 'LP_sparse']
+__all__ = ['LP', 'LP_sparse', 'LP_hirschberg', 'LP_backpointers',
+           'LP_diagonal', 'LP_length', 'LP_batch', 'LP_contiguous',
+           'IncrementalLP', 'LP_packed', 'LP_banded', 'encode_word',
+           'open_word']
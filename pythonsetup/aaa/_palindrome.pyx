@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# cython: boundscheck=False, wraparound=False
+"""
+Compiled counterpart of the hot loops of :mod:`longestpalindrome` (words
+encoded by :func:`longestpalindrome.encode_word`)
+"""
+
+__author__ = "Begon Jean-Michel <jm.begon@gmail.com>"
+__copyright__ = "3-clause BSD License"
+__version__ = 'dev'
+
+from libc.stdlib cimport malloc, free
+
+ctypedef fused code_t:
+    unsigned char
+    unsigned short
+    unsigned int
+
+
+cdef void _manacher(const code_t[::1] S, Py_ssize_t* radius,
+                    Py_ssize_t* best_length,
+                    Py_ssize_t* best_offset) noexcept nogil:
+    cdef Py_ssize_t n = S.shape[0]
+    cdef Py_ssize_t i, k, left, right
+    cdef Py_ssize_t length = 0, offset = 0
+    # Odd palindromes
+    left, right = 0, -1
+    for i in range(n):
+        if i > right:
+            k = 1
+        else:
+            k = min(radius[left + right - i], right - i + 1)
+        while i - k >= 0 and i + k < n and S[i-k] == S[i+k]:
+            k += 1
+        radius[i] = k
+        if i + k - 1 > right:
+            left, right = i - k + 1, i + k - 1
+        if 2*k - 1 > length:
+            length, offset = 2*k - 1, i - k + 1
+    # Even palindromes
+    left, right = 0, -1
+    for i in range(n):
+        if i > right:
+            k = 0
+        else:
+            k = min(radius[left + right - i + 1], right - i + 1)
+        while i - k - 1 >= 0 and i + k < n and S[i-k-1] == S[i+k]:
+            k += 1
+        radius[i] = k
+        if i + k - 1 > right:
+            left, right = i - k, i + k - 1
+        if 2*k > length or (2*k == length and i - k < offset):
+            length, offset = 2*k, i - k
+    best_length[0] = length
+    best_offset[0] = offset
+
+
+def manacher(const code_t[::1] S):
+    """
+    Return the (length, offset) of the longest palindrome substring of the
+    encoded word S (the leftmost one if several)
+    """
+    cdef Py_ssize_t length = 0, offset = 0
+    cdef Py_ssize_t* radius
+    if S.shape[0] == 0:
+        return 0, 0
+    radius = <Py_ssize_t*>malloc(S.shape[0]*sizeof(Py_ssize_t))
+    if radius == NULL:
+        raise MemoryError()
+    try:
+        with nogil:
+            _manacher(S, radius, &length, &offset)
+    finally:
+        free(radius)
+    return length, offset
@@ -7,6 +7,23 @@ __author__ = "Begon Jean-Michel <jm.begon@gmail.com>"
 __copyright__ = "3-clause BSD License"
 __version__ = 'dev'
 
+from array import array
+from collections import deque
+from itertools import islice
+import mmap
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+try:
+    from . import _palindrome
+except (ImportError, ValueError):
+    # Not built (or run as a script): pure Python only
+    _palindrome = None
+
+
 def LP(S):
     """Find the longest palindrome subsequence in S"""
     T = [ [None]*len(S) for _ in range(len(S))]
@@ -65,15 +82,720 @@ def LP_sparse_aux(S, T, i, j):
     return T[(i, j)]
 
 
+#-------------------Packed sparse version--------------------------------
+
+def LP_packed(S, stats=None):
+    """
+    Find the longest palindrome subsequence in S (packed sparse version)
+
+    Same cells and same result as :func:`LP_sparse`, but the table maps
+    the integer i*len(S) + j to the length of the palindrome of S[i..j]
+    instead of mapping the tuple (i, j) to the palindrome itself, and the
+    recursion is replaced by an explicit stack.
+
+    Parameters
+    ----------
+    S : str, bytes or array (see :func:`encode_word`)
+        The word
+    stats : dict or None (Default : None)
+        If a dict, it is filled with the number of entries of the table
+        ("entries") and its approximate size in bytes ("bytes")
+    """
+    n = len(S)
+    letters = _letters(S)
+    T = {}
+    stack = [(0, n-1)] if n > 0 else []
+    while stack:
+        i, j = stack[-1]
+        key = i*n + j
+        if key in T:
+            stack.pop()
+        elif i == j:
+            T[key] = 1
+            stack.pop()
+        elif letters[i] == letters[j]:
+            if i+1 > j-1:
+                T[key] = 2
+                stack.pop()
+            elif key + n - 1 in T:
+                T[key] = T[key + n - 1] + 2
+                stack.pop()
+            else:
+                stack.append((i+1, j-1))
+        else:
+            left = T.get(key - 1)
+            right = T.get(key + n)
+            if left is not None and right is not None:
+                T[key] = max(left, right)
+                stack.pop()
+            else:
+                if left is None:
+                    stack.append((i, j-1))
+                if right is None:
+                    stack.append((i+1, j))
+    if stats is not None:
+        stats["entries"] = len(T)
+        stats["bytes"] = (sys.getsizeof(T) +
+                          sum(sys.getsizeof(k) + sys.getsizeof(v)
+                              for k, v in T.items()))
+    left = []
+    right = []
+    i, j = 0, n-1
+    while i <= j:
+        if i == j:
+            left.append(i)
+            break
+        if letters[i] == letters[j]:
+            left.append(i)
+            right.append(j)
+            i += 1
+            j -= 1
+        elif T[i*n + j - 1] < T[(i+1)*n + j]:
+            i += 1
+        else:
+            j -= 1
+    return _gather(S, left + right[::-1])
+
+
+#-------------------Integer encoding of the words------------------------
+
+def encode_word(S):
+    """
+    Return the characters of S as an array of integers
+
+    Parameters
+    ----------
+    S : str, unicode, bytes, bytearray, memoryview, mmap or array
+        The word. Byte buffers are viewed (not copied) as uint8 arrays,
+        memoryviews of wider integers as arrays of their own type; text
+        is encoded as uint8, uint16 or uint32 code points, whichever is
+        the smallest to fit; arrays are returned as they are.
+
+    Return
+    ------
+    codes : array of unsigned int
+        The encoded word
+
+    Raise
+    -----
+    ValueError
+        If S is a memoryview of non-integer items
+    """
+    if isinstance(S, np.ndarray):
+        return S
+    if isinstance(S, memoryview):
+        if S.format in ("B", "b", "c"):
+            return np.asarray(S).view(np.uint8).reshape(-1)
+        codes = np.asarray(S)
+        if codes.dtype.kind not in "ui":
+            raise ValueError("Cannot encode a memoryview of format '%s'"
+                             % S.format)
+        return codes.reshape(-1)
+    if isinstance(S, (bytes, bytearray, mmap.mmap)):
+        return np.frombuffer(S, dtype=np.uint8)
+    codes = np.frombuffer(S.encode("utf-32-le"), dtype="<u4")
+    top = codes.max() if len(codes) > 0 else 0
+    for dtype in (np.uint8, np.uint16):
+        if top <= np.iinfo(dtype).max:
+            return codes.astype(dtype)
+    return codes
+
+
+def _letters(S):
+    """
+    Return the encoded letters of S (see :func:`encode_word`) as a
+    sequence cheap to index and compare: bytes for one-byte codes, a list
+    of int otherwise
+    """
+    codes = encode_word(S)
+    if codes.dtype.itemsize == 1:
+        return codes.tobytes()
+    return codes.tolist()
+
+
+def open_word(path):
+    """
+    Memory-map a file as a word of bytes
+
+    Return
+    ------
+    codes : array of uint8
+        A read-only view of the file, paged in as the kernels need it
+    """
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode="r")
+
+
+# Inputs whose palindromes are returned as bytes (see _gather)
+_BUFFERS = (bytearray, memoryview, mmap.mmap)
+
+
+def _gather(S, indices):
+    """
+    Build the subsequence of S made of the letters at `indices`: of the
+    type of S for text and arrays, bytes for buffers of bytes (bytearray,
+    mmap, memoryview) and an array for memoryviews of wider integers
+    """
+    if isinstance(S, (np.ndarray,) + _BUFFERS):
+        codes = encode_word(S)[np.asarray(indices, dtype=np.intp)]
+        if isinstance(S, np.ndarray) or codes.dtype.itemsize != 1:
+            return np.array(codes)
+        return codes.tobytes()
+    return S[:0].join(S[k:k+1] for k in indices)
+
+
+#-------------------Back-pointers version--------------------------------
+# Direction codes of the back-pointer table
+_MIDDLE = 0  # i == j: S[i] is the middle of the palindrome
+_BOTH = 1    # S[i] == S[j]: both ends belong to the palindrome
+_DOWN = 2    # the palindrome of S[i+1..j]
+_LEFT = 3    # the palindrome of S[i..j-1]
+
+
+def _trace_back(S, code_of):
+    """Build the palindrome given the direction code of each cell (i, j)"""
+    left = []
+    right = []
+    i, j = 0, len(S)-1
+    while i <= j:
+        code = code_of(i, j)
+        if code == _MIDDLE:
+            left.append(i)
+            break
+        if code == _BOTH:
+            left.append(i)
+            right.append(j)
+            i += 1
+            j -= 1
+        elif code == _DOWN:
+            i += 1
+        else:
+            j -= 1
+    return _gather(S, left + right[::-1])
+
+
+def LP_backpointers(S):
+    """
+    Find the longest palindrome subsequence in S (back-pointers version)
+
+    Same result as :func:`LP`, but the table only holds a uint8 direction
+    code per cell (the lengths are kept for two rows only) and the
+    palindrome is traced back and built once at the end
+    """
+    n = len(S)
+    return _LP_backpointers(S, np.zeros((n, n), dtype=np.uint8),
+                            [0]*(n + 1), [0]*(n + 1))
+
+
+def _LP_backpointers(S, codes, prev, cur):
+    """
+    :func:`LP_backpointers` working in the given buffers: a table of
+    codes and two rows of lengths, at least len(S) (+1) wide. Their
+    content does not matter.
+    """
+    n = len(S)
+    if n == 0:
+        return S[:0]
+    letters = _letters(S)
+    # Lengths of rows i+1 and i. Column i of row i+1 must read 0 (the
+    # empty range) but a row only writes from its own column on: zero it
+    # beforehand in the buffer of row i+1.
+    cur[n-2] = 0
+    for i in range(n-1, -1, -1):
+        row = [_MIDDLE]
+        cur[i] = 1
+        for j in range(i+1, n):
+            if letters[i] == letters[j]:
+                cur[j] = prev[j-1] + 2
+                row.append(_BOTH)
+            elif cur[j-1] < prev[j]:
+                cur[j] = prev[j]
+                row.append(_DOWN)
+            else:
+                cur[j] = cur[j-1]
+                row.append(_LEFT)
+        codes[i, i:n] = row
+        prev, cur = cur, prev
+        if i >= 2:
+            cur[i-2] = 0
+    return _trace_back(S, lambda i, j: codes[i, j])
+
+
+#-------------------Banded version--------------------------------------
+# Reaching (i, j) from (0, n-1) deletes i letters on the left and n-1-j on
+# the right, and every pair of letters kept removes one of each: a path
+# with at most k deletions in total stays within |i + j - (n-1)| <= k.
+
+def LP_banded(S, k=None):
+    """
+    Find the longest palindrome subsequence in S, assuming it is at most
+    k deletions away from a palindrome (banded version)
+
+    Only the cells within k of the anti-diagonal are computed: O(n*k)
+    time and memory. If the palindrome found is more than k deletions
+    away from S, the assumption was wrong and the full table is computed
+    instead (see :func:`LP_backpointers`), so that the length is always
+    exact. The palindrome itself is the one of :func:`LP` when the band
+    holds all the cells LP relies on.
+
+    Parameters
+    ----------
+    S : str, bytes or array (see :func:`encode_word`)
+        The word
+    k : int or None (Default : None)
+        The bound on the number of deletions (None for no bound)
+    """
+    n = len(S)
+    if k is None or 2*k >= n:
+        return LP_backpointers(S)
+    letters = _letters(S)
+    width = 2*k + 1
+    out = -2*(n + 1)  # Length of the cells outside the band
+    lengths = array("i", [out])*(n*width)
+    codes = array("B", [0])*(n*width)
+
+    def get(i, j):
+        if i > j:
+            return 0
+        offset = i + j - (n-1) + k
+        if 0 <= offset < width:
+            return lengths[i*width + offset]
+        return out
+
+    for i in range(n-1, -1, -1):
+        for j in range(max(i, n-1-i-k), min(n-1, n-1-i+k) + 1):
+            cell = i*width + i + j - (n-1) + k
+            if i == j:
+                lengths[cell] = 1
+                codes[cell] = _MIDDLE
+            elif letters[i] == letters[j]:
+                lengths[cell] = get(i+1, j-1) + 2
+                codes[cell] = _BOTH
+            else:
+                left = get(i, j-1)
+                right = get(i+1, j)
+                if left < right:
+                    lengths[cell] = right
+                    codes[cell] = _DOWN
+                else:
+                    lengths[cell] = left
+                    codes[cell] = _LEFT
+    if get(0, n-1) < n - k:
+        return LP_backpointers(S)
+    return _trace_back(S, lambda i, j: codes[i*width + i + j - (n-1) + k])
+
+
+#-------------------Vectorized anti-diagonal version---------------------
+
+def LP_diagonal(S):
+    """
+    Find the longest palindrome subsequence in S (vectorized version)
+
+    Same result as :func:`LP_sparse`. The cells (i, i+d) of a given span
+    d only depend on spans d-1 and d-2, so that they are computed all at
+    once with NumPy. Only the direction codes of the cells are stored.
+
+    Parameters
+    ----------
+    S : str or bytes
+        The word
+    """
+    n = len(S)
+    if n == 0:
+        return S[:0]
+    a = encode_word(S)
+    # Lengths of spans d-2 and d-1 (the span -1 is the empty range)
+    before = np.zeros(n + 1, dtype=np.int64)
+    last = np.ones(n, dtype=np.int64)
+    codes = [np.zeros(n, dtype=np.uint8)]
+    for d in range(1, n):
+        left = last[:-1]
+        right = last[1:]
+        eq = a[:n-d] == a[d:]
+        down = left < right
+        current = np.where(eq, before[1:n-d+1] + 2,
+                           np.where(down, right, left))
+        code = np.full(n-d, _LEFT, dtype=np.uint8)
+        code[down] = _DOWN
+        code[eq] = _BOTH
+        codes.append(code)
+        before, last = last, current
+    return _trace_back(S, lambda i, j: codes[j-i][i])
+
+
+#-------------------Linear memory version (Hirschberg)-------------------
+# The longest palindrome subsequence of S is A + [m] + reversed(A), with
+# A a longest common subsequence of S[:k] and reversed(S[k+|m|:]) for the
+# best split k. The lengths of those LCS, for every k at once, lie on an
+# anti-diagonal of the LCS table of S and reversed(S), which is computed
+# one row at a time. A itself is rebuilt by Hirschberg's divide and
+# conquer, so that the memory stays linear.
+
+def _lcs_next_row(prev, b, x):
+    """
+    Row of the LCS table for one more symbol x of the first sequence,
+    given the previous row `prev` (over the prefixes of b)
+    """
+    t = prev.copy()
+    np.maximum(prev[1:], prev[:-1] + (b == x), out=t[1:])
+    return np.maximum.accumulate(t)
+
+
+def _lcs_last_row(a, b):
+    """Lengths of the LCS of a and each prefix of b"""
+    row = np.zeros(len(b) + 1, dtype=np.int64)
+    for x in a:
+        row = _lcs_next_row(row, b, x)
+    return row
+
+
+def _hirschberg(a, b, offset=0):
+    """Indices (shifted by offset) in a of a longest common subsequence"""
+    if len(a) == 0 or len(b) == 0:
+        return []
+    if len(a) == 1:
+        return [offset] if (b == a[0]).any() else []
+    mid = len(a) // 2
+    left = _lcs_last_row(a[:mid], b)
+    right = _lcs_last_row(a[mid:][::-1], b[::-1])
+    k = int(np.argmax(left + right[::-1]))
+    return (_hirschberg(a[:mid], b[:k], offset) +
+            _hirschberg(a[mid:], b[k:], offset + mid))
+
+
+def LP_hirschberg(S):
+    """
+    Find the longest palindrome subsequence in S (linear memory version)
+
+    O(n^2) time, rows of the tables vectorized, and O(n) memory
+    """
+    n = len(S)
+    if n == 0:
+        return S[:0]
+    a = encode_word(S)
+    r = a[::-1]
+    # Best split: (length, k, whether S[k] is the middle)
+    best = (0, 0, False)
+    row = np.zeros(n + 1, dtype=np.int64)
+    for k in range(n + 1):
+        if k > 0:
+            row = _lcs_next_row(row, r, a[k-1])
+        if 2*row[n-k] > best[0]:
+            best = (2*row[n-k], k, False)
+        if k < n and 2*row[n-k-1] + 1 > best[0]:
+            best = (2*row[n-k-1] + 1, k, True)
+    _, k, odd = best
+    m = n - k - 1 if odd else n - k
+    half = _hirschberg(a[:k], r[:m])
+    indices = half + ([k] if odd else []) + half[::-1]
+    return _gather(S, indices)
+
+
+#-------------------Length only (bit-parallel)---------------------------
+
+def LP_length(S):
+    """
+    Length of the longest palindrome subsequence in S (bit-parallel)
+
+    This is the length of the longest common subsequence of S and its
+    reverse, computed with one bit per character of S packed in a Python
+    integer (Allison-Dix / Hyyro): O(n^2/w) word operations and no table
+    """
+    codes = encode_word(S).tolist()
+    n = len(codes)
+    full = (1 << n) - 1
+    # Positions of each symbol in S
+    matches = {}
+    for i in range(n):
+        c = codes[i]
+        matches[c] = matches.get(c, 0) | (1 << i)
+    V = full
+    for i in range(n-1, -1, -1):
+        U = V & matches[codes[i]]
+        V = ((V + U) | (V - U)) & full
+    return n - bin(V).count("1")
+
+
+#-------------------Incremental version---------------------------------
+
+class IncrementalLP(object):
+    """
+    =============
+    IncrementalLP
+    =============
+    An :class:`IncrementalLP` follows the longest palindrome subsequence
+    of a growing text. Only the last column of the table (the lengths
+    for all the suffixes of the text) is kept, and each new character
+    computes the next one: O(n) vectorized work per character.
+
+    The new column follows from the last one: for each i, the length for
+    S[i..j] is the cumulative maximum, from i = j down, of either the
+    length for S[i+1..j-1] plus 2 (if S[i] == S[j]) or the length for
+    S[i..j-1].
+
+    Constructor parameters
+    ----------------------
+    S : str, bytes or array (Default : "")
+        The initial text (see :func:`encode_word`). The pieces appended
+        afterwards should be of the same type, which is the one of the
+        text and of the palindrome (see :func:`_gather` for buffers).
+    """
+
+    def __init__(self, S=""):
+        self._pieces = []
+        self._codes = np.zeros(16, dtype=np.uint32)
+        self._column = np.zeros(16, dtype=np.int64)
+        self._n = 0
+        self.extend(S)
+
+    def __len__(self):
+        return self._n
+
+    def _reserve(self, size):
+        capacity = len(self._codes)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        codes = np.zeros(capacity, dtype=np.uint32)
+        codes[:self._n] = self._codes[:self._n]
+        self._codes = codes
+        column = np.zeros(capacity, dtype=np.int64)
+        column[:self._n] = self._column[:self._n]
+        self._column = column
+
+    def extend(self, S):
+        """Append the characters of S to the text"""
+        codes = encode_word(S)
+        self._reserve(self._n + len(codes))
+        if len(codes) > 0:
+            self._pieces.append(S)
+        for x in codes:
+            j = self._n
+            self._codes[j] = x
+            column = self._column
+            t = np.empty(j + 1, dtype=np.int64)
+            # Previous column: lengths for S[i..j-1] (and 0 for S[j..j-1])
+            t[:j] = column[:j]
+            t[j] = 1
+            eq = np.flatnonzero(self._codes[:j] == x)
+            t[eq] = column[eq + 1] + 2
+            column[:j+1] = np.maximum.accumulate(t[::-1])[::-1]
+            self._n += 1
+
+    def append(self, c):
+        """Append a character to the text"""
+        self.extend(c)
+
+    def longest(self):
+        """Length of the longest palindrome subsequence of the text"""
+        if self._n == 0:
+            return 0
+        return int(self._column[0])
+
+    def text(self):
+        """Return the text"""
+        if not self._pieces:
+            return ""
+        first = self._pieces[0]
+        if isinstance(first, (np.ndarray,) + _BUFFERS):
+            # Same types as _gather
+            codes = np.concatenate([encode_word(S) for S in self._pieces])
+            if isinstance(first, np.ndarray) or codes.dtype.itemsize != 1:
+                return codes
+            return codes.tobytes()
+        return first[:0].join(self._pieces)
+
+    def palindrome(self):
+        """Longest palindrome subsequence of the text (recomputed)"""
+        return LP_diagonal(self.text())
+
+
+#-------------------Contiguous palindrome (Manacher)--------------------
+
+def LP_contiguous(S):
+    """
+    Find the longest palindrome substring (contiguous) in S
+
+    Manacher's algorithm: O(n) time and memory. The loop is compiled
+    when the extension is built (tens of milliseconds per megabyte), and
+    runs in pure Python otherwise (about a second per megabyte).
+
+    Parameters
+    ----------
+    S : str, bytes or array (see :func:`encode_word`)
+        The word
+
+    Return
+    ------
+    palindrome : same type as S (see :func:`_gather` for buffers)
+        The longest palindrome substring (the leftmost one if several)
+    offset : int
+        Its position in S
+    """
+    length, offset = None, None
+    if _palindrome is not None:
+        codes = encode_word(S)
+        if codes.dtype in (np.uint8, np.uint16, np.uint32):
+            length, offset = _palindrome.manacher(np.ascontiguousarray(codes))
+    if length is None:
+        length, offset = _manacher(S)
+    if isinstance(S, _BUFFERS):
+        return _gather(S, range(offset, offset + length)), offset
+    return S[offset:offset + length], offset
+
+
+def _manacher(S):
+    """
+    Pure Python version of the loop of :func:`LP_contiguous`: return the
+    length and offset of the longest palindrome substring
+    """
+    S = _letters(S)
+    n = len(S)
+    best_length, best_offset = 0, 0
+    # odd[i] (resp. even[i]): number of palindromes of odd (resp. even)
+    # length centered on i (resp. ending their left half at i-1);
+    # [left, right] is the rightmost palindrome found so far
+    odd = [0]*n
+    left, right = 0, -1
+    for i in range(n):
+        k = 1 if i > right else min(odd[left + right - i], right - i + 1)
+        while i - k >= 0 and i + k < n and S[i-k] == S[i+k]:
+            k += 1
+        odd[i] = k
+        if i + k - 1 > right:
+            left, right = i - k + 1, i + k - 1
+        if 2*k - 1 > best_length:
+            best_length, best_offset = 2*k - 1, i - k + 1
+    even = odd  # Reuse the buffer
+    left, right = 0, -1
+    for i in range(n):
+        k = 0 if i > right else min(even[left + right - i + 1], right - i + 1)
+        while i - k - 1 >= 0 and i + k < n and S[i-k-1] == S[i+k]:
+            k += 1
+        even[i] = k
+        if i + k - 1 > right:
+            left, right = i - k, i + k - 1
+        if 2*k > best_length or (2*k == best_length and
+                                 i - k < best_offset):
+            best_length, best_offset = 2*k, i - k
+    return best_length, best_offset
+
+
+#-------------------Batches of words------------------------------------
+
+def _LP_chunk(words):
+    """Palindromes of a list of words, with buffers reused across words"""
+    m = max(len(word) for word in words)
+    codes = np.zeros((m, m), dtype=np.uint8)
+    prev = [0]*(m + 1)
+    cur = [0]*(m + 1)
+    return [_LP_backpointers(word, codes, prev, cur) for word in words]
+
+
+def LP_batch(words, n_jobs=None, chunk_size=1024):
+    """
+    Generator of the longest palindrome subsequences of many words
+
+    The words are split in chunks, handed over to a pool of processes.
+    Within a chunk, the buffers are sized once for the longest word.
+    Only a few chunks per process are in flight at any time, so that the
+    words can be streamed.
+
+    Parameters
+    ----------
+    words : iterable of str
+        The words
+    n_jobs : int or None (Default : None)
+        The number of processes (None for as many as CPUs)
+    chunk_size : int (Default : 1024)
+        The number of words per chunk
+
+    Yield
+    -----
+    palindrome : str
+        The palindrome of :func:`LP_sparse` for each word, in order
+    """
+    if n_jobs is None:
+        n_jobs = multiprocessing.cpu_count()
+    words = iter(words)
+    chunks = iter(lambda: list(islice(words, chunk_size)), [])
+    if n_jobs <= 1:
+        for chunk in chunks:
+            for palindrome in _LP_chunk(chunk):
+                yield palindrome
+        return
+    pool = multiprocessing.Pool(n_jobs)
+    try:
+        pending = deque()
+        for chunk in islice(chunks, 2*n_jobs):
+            pending.append(pool.apply_async(_LP_chunk, (chunk,)))
+        while pending:
+            results = pending.popleft().get()
+            for chunk in islice(chunks, 1):
+                pending.append(pool.apply_async(_LP_chunk, (chunk,)))
+            for palindrome in results:
+                yield palindrome
+    finally:
+        pool.terminate()
+
+
 if __name__ == "__main__":
     import argparse
 
     #----------Parsing command line args-----------#
     parser = argparse.ArgumentParser()
-    parser.add_argument("word", 
+    parser.add_argument("word",
+                        nargs="?",
                         help="The word in which to look for the longest palindrome subsequence")
+    parser.add_argument("-f", "--file",
+                        help="Process the words of this file, one per line "
+                             "('-' for the standard input), in batch")
+    parser.add_argument("-i", "--input",
+                        help="Read the word from this file (memory-mapped) "
+                             "rather than from the command line")
+    parser.add_argument("-c", "--contiguous",
+                        action="store_true",
+                        help="Look for the longest palindrome substring "
+                             "(contiguous) instead, and print its offset")
+    parser.add_argument("-j", "--jobs",
+                        type=int,
+                        help="The number of processes for the batch mode "
+                             "(default: as many as CPUs)")
 
     args = parser.parse_args()
 
-    palindrome =  LP_sparse(args.word)
-    print palindrome, "(size", len(palindrome),")"
\ No newline at end of file
+    if args.file is not None:
+        hdl = sys.stdin if args.file == "-" else open(args.file)
+        try:
+            words = (line.rstrip("\r\n") for line in hdl)
+            if args.contiguous:
+                for word in words:
+                    palindrome, offset = LP_contiguous(word)
+                    sys.stdout.write("%s %d\n" % (palindrome, offset))
+            else:
+                for palindrome in LP_batch(words, args.jobs):
+                    sys.stdout.write(palindrome + "\n")
+        finally:
+            if hdl is not sys.stdin:
+                hdl.close()
+    elif args.input is not None:
+        word = open_word(args.input)
+        if args.contiguous:
+            palindrome, offset = LP_contiguous(word)
+            sys.stdout.write("%s (size %d, offset %d)\n" %
+                             (palindrome.tobytes(), len(palindrome), offset))
+        else:
+            palindrome = LP_hirschberg(word)
+            sys.stdout.write("%s (size %d)\n" %
+                             (palindrome.tobytes(), len(palindrome)))
+    elif args.word is None:
+        parser.error("Either a word, an input file or a file of words is "
+                     "required")
+    elif args.contiguous:
+        palindrome, offset = LP_contiguous(args.word)
+        print palindrome, "(size", len(palindrome), ", offset", offset, ")"
+    else:
+        palindrome =  LP_sparse(args.word)
+        print palindrome, "(size", len(palindrome),")"
@@ -9,13 +9,20 @@ __version__ = 'dev'
 
 
 import os
+
+import numpy
 from numpy.distutils.misc_util import Configuration
 
 
 def configuration(parent_package="", top_path=None):
 
     config = Configuration("aaa", parent_package, top_path)
-    
+
+    config.add_extension("_palindrome",
+                         sources=["_palindrome.c"],
+                         include_dirs=[numpy.get_include()],
+                         extra_compile_args=["-O3"])
+
     config.add_subpackage('test')
 
     return config
@@ -7,8 +7,29 @@ __author__ = "Begon Jean-Michel <jm.begon@gmail.com>"
 __copyright__ = "3-clause BSD License"
 __version__ = 'dev'
 
+import os
+import random
+import tempfile
+
 import nose
-from main.aaa import LP, LP_sparse 
+import numpy as np
+from main.aaa import LP, LP_sparse, LP_hirschberg, LP_backpointers
+from main.aaa import LP_diagonal, LP_length, LP_batch, LP_contiguous
+from main.aaa import IncrementalLP, LP_packed, LP_banded
+from main.aaa import encode_word, open_word
+from main.aaa import longestpalindrome
+
+
+def pure_python(check):
+    """Run `check` with the compiled extension disabled"""
+    def run(*args):
+        compiled = longestpalindrome._palindrome
+        longestpalindrome._palindrome = None
+        try:
+            check(*args)
+        finally:
+            longestpalindrome._palindrome = compiled
+    return run
 
 def test_lp_caractere():
     """Test the longest palindrome of 'caractere'"""
@@ -17,4 +38,196 @@ def test_lp_caractere():
 def test_lps_caractere():
     """Test the longest palindrome of 'caractere' (sparse version)"""
     nose.tools.assert_equal(LP_sparse("caractere"), "carac")
-    
\ No newline at end of file
+
+def test_lph_caractere():
+    """Test the longest palindrome of 'caractere' (linear memory version)"""
+    nose.tools.assert_equal(LP_hirschberg("caractere"), "carac")
+
+def check_lph(word):
+    """Test the linear memory version against the dense one"""
+    palindrome = LP_hirschberg(word)
+    nose.tools.assert_equal(len(palindrome), len(LP(word)))
+    nose.tools.assert_equal(palindrome, palindrome[::-1])
+    letters = iter(word)
+    nose.tools.assert_true(all(c in letters for c in palindrome))
+
+def test_lph():
+    for word in ("a", "ab", "aab", "abcba", "abacdfgdcaba", "bbbab",
+                 "palindrome", "mississippi", "xyzzyxab"):
+        yield check_lph, word
+
+def check_lpb(word):
+    """Test the back-pointers version against the dense one"""
+    nose.tools.assert_equal(LP_backpointers(word), LP(word))
+
+def test_lpb():
+    for word in ("caractere", "a", "ab", "aab", "abcba", "abacdfgdcaba",
+                 "bbbab", "palindrome", "mississippi", "xyzzyxab"):
+        yield check_lpb, word
+
+def check_lpd(word):
+    """Test the vectorized version against the sparse one"""
+    nose.tools.assert_equal(LP_diagonal(word), LP_sparse(word))
+
+def test_lpd():
+    for word in ("caractere", u"caract\xe9re", b"caractere", "a", "ab",
+                 "aab", "abcba", "abacdfgdcaba", "bbbab", "mississippi"):
+        yield check_lpd, word
+
+def check_lp_length(word):
+    """Test the bit-parallel length against the sparse version"""
+    nose.tools.assert_equal(LP_length(word), len(LP_sparse(word)))
+
+def test_lp_length():
+    for word in ("caractere", b"caractere", "", "a", "ab", "aab", "abcba",
+                 "abacdfgdcaba", "bbbab", "mississippi"):
+        yield check_lp_length, word
+
+def test_lp_batch():
+    """Test the batch version against the sparse one"""
+    words = ["caractere", "", "a", "ab", "aab", "abcba", "abacdfgdcaba",
+             "bbbab", "palindrome", "mississippi", "xyzzyxab"]*20
+    expected = [LP_sparse(word) for word in words]
+    nose.tools.assert_equal(list(LP_batch(words, n_jobs=1, chunk_size=7)),
+                            expected)
+    nose.tools.assert_equal(list(LP_batch(iter(words), n_jobs=2,
+                                          chunk_size=7)),
+                            expected)
+
+def test_lp_contiguous():
+    """Test the longest palindrome substring"""
+    nose.tools.assert_equal(LP_contiguous("caractere"), ("carac", 0))
+    nose.tools.assert_equal(LP_contiguous("abacdfgdcaba"), ("aba", 0))
+    nose.tools.assert_equal(LP_contiguous("xabbay"), ("abba", 1))
+    nose.tools.assert_equal(LP_contiguous("mississippi"), ("ississi", 1))
+    nose.tools.assert_equal(LP_contiguous(""), ("", 0))
+
+def check_lp_contiguous(word):
+    """Test the longest palindrome substring against a brute-force search"""
+    n = len(word)
+    best = max((word[i:j] for i in range(n + 1) for j in range(i, n + 1)
+                if word[i:j] == word[i:j][::-1]), key=len)
+    nose.tools.assert_equal(LP_contiguous(word), (best, word.find(best)))
+
+def test_lp_contiguous_random():
+    rng = random.Random(0)
+    for _ in range(20):
+        word = "".join(rng.choice("ab") for _ in range(rng.randrange(20)))
+        yield check_lp_contiguous, word
+        yield pure_python(check_lp_contiguous), word
+    yield check_lp_contiguous, u"\u0151ab\u0151a\u0151"
+
+def test_incremental():
+    """Test :class:`IncrementalLP`"""
+    word = "abacdfgdcabaypalindromemississippi"
+    incremental = IncrementalLP()
+    nose.tools.assert_equal(incremental.longest(), 0)
+    for k in range(len(word)):
+        incremental.append(word[k])
+        nose.tools.assert_equal(incremental.longest(),
+                                len(LP_sparse(word[:k+1])))
+    incremental = IncrementalLP("cara")
+    incremental.extend("ctere")
+    nose.tools.assert_equal(incremental.longest(), 5)
+    nose.tools.assert_equal(incremental.palindrome(), "carac")
+    codes = encode_word("caractere")
+    incremental = IncrementalLP(codes[:4])
+    incremental.extend(codes[4:])
+    nose.tools.assert_equal(incremental.text().tolist(), codes.tolist())
+    nose.tools.assert_equal(incremental.palindrome().tobytes(), b"carac")
+    incremental = IncrementalLP(bytearray(b"cara"))
+    incremental.extend(bytearray(b"ctere"))
+    nose.tools.assert_equal(incremental.text(), b"caractere")
+    nose.tools.assert_equal(incremental.palindrome(), b"carac")
+    nose.tools.assert_equal(IncrementalLP().text(), "")
+
+def check_lpp(word):
+    """Test the packed sparse version against the sparse one"""
+    nose.tools.assert_equal(LP_packed(word), LP_sparse(word))
+
+def test_lpp():
+    for word in ("caractere", "", "a", "ab", "aab", "abcba", "abacdfgdcaba",
+                 "bbbab", "palindrome", "mississippi", "xyzzyxab"):
+        yield check_lpp, word
+    stats = {}
+    LP_packed("caractere", stats)
+    nose.tools.assert_true(0 < stats["entries"] <= 9*9)
+    nose.tools.assert_true(stats["bytes"] > 0)
+
+def test_lpbd_caractere():
+    """Test the longest palindrome of 'caractere' (banded version)"""
+    for k in (None, 0, 2, 4, 8):
+        nose.tools.assert_equal(LP_banded("caractere", k), "carac")
+
+def check_lpbd(word, k):
+    """Test the banded version against the dense one"""
+    nose.tools.assert_equal(LP_banded(word, k), LP(word))
+
+def test_lpbd():
+    for word in ("a", "ab", "aab", "abcba", "abacdfgdcaba", "bbbab",
+                 "palindrome", "mississippi", "xyzzyxab", "racecarx"):
+        for k in (0, 1, 3):
+            yield check_lpbd, word, k
+
+def test_encode_word():
+    """Test the integer encoding of the words"""
+    nose.tools.assert_equal(encode_word(b"carac").dtype, np.uint8)
+    nose.tools.assert_equal(encode_word(u"car\xe0c").dtype, np.uint8)
+    nose.tools.assert_equal(encode_word(u"car\u0151c").dtype, np.uint16)
+    nose.tools.assert_equal(encode_word(u"caractere").tolist(),
+                            encode_word(b"caractere").tolist())
+    codes = encode_word(bytearray(b"caractere"))
+    nose.tools.assert_equal(codes.tolist(), [ord(c) for c in "caractere"])
+
+def check_lp_buffer(function, word):
+    """Test a version on byte buffers and arrays"""
+    expected = LP_sparse(word.decode("latin-1")).encode("latin-1")
+    for buf in (word, bytearray(word), memoryview(word)):
+        palindrome = function(buf)
+        nose.tools.assert_true(isinstance(palindrome, bytes))
+        nose.tools.assert_equal(palindrome, expected)
+    codes = np.frombuffer(word, dtype=np.uint8)
+    nose.tools.assert_equal(function(codes).tobytes(), expected)
+    wide = function(memoryview(codes.astype(np.uint16)))
+    nose.tools.assert_equal(wide.tolist(), list(bytearray(expected)))
+
+def test_lp_buffer():
+    for function in (LP_backpointers, LP_diagonal, LP_hirschberg, LP_packed,
+                     LP_banded):
+        for word in (b"caractere", b"abacdfgdcaba", b"mississippi"):
+            yield check_lp_buffer, function, word
+    wide = memoryview(np.array([1, 2, 1, 3], dtype=np.uint16))
+    nose.tools.assert_equal(LP_length(wide), 3)
+    nose.tools.assert_equal(LP_contiguous(wide)[0].tolist(), [1, 2, 1])
+    for buf in (bytearray(b"xabay"), memoryview(b"xabay")):
+        nose.tools.assert_equal(LP_contiguous(buf), (b"aba", 1))
+    nose.tools.assert_raises(ValueError, encode_word,
+                             memoryview(np.array([1.0, 2.0])))
+
+def check_lp_wide(function, word):
+    """Test a version on text encoded with two bytes per letter"""
+    codes = encode_word(word)
+    nose.tools.assert_equal(codes.dtype, np.uint16)
+    nose.tools.assert_equal(function(codes).tolist(),
+                            encode_word(LP_sparse(word)).tolist())
+
+def test_lp_wide():
+    for function in (LP_backpointers, LP_diagonal, LP_hirschberg, LP_packed,
+                     LP_banded):
+        yield check_lp_wide, function, u"\u0151car\u0151ct\u0151re"
+
+def test_open_word():
+    """Test the memory-mapped words"""
+    fd, path = tempfile.mkstemp()
+    try:
+        os.write(fd, b"xxabcdefedcbayyy")
+        os.close(fd)
+        word = open_word(path)
+        nose.tools.assert_equal(LP_length(word), 11)
+        nose.tools.assert_equal(LP_hirschberg(word).tobytes(), b"abcdefedcba")
+        palindrome, offset = LP_contiguous(word)
+        nose.tools.assert_equal((palindrome.tobytes(), offset),
+                                (b"abcdefedcba", 2))
+        del word, palindrome
+    finally:
+        os.remove(path)
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+The :mod:`benchmark` module times the N-queens solvers over a range of
+board sizes and compares the results against a stored baseline.
+
+Usage: python -m pythonsetup.benchmark 4 10 -o results.json -b baseline.json
+"""
+
+__author__ = "Begon Jean-Michel <jm.begon@gmail.com>"
+__copyright__ = "3-clause BSD License"
+__version__ = 'dev'
+
+import json
+import multiprocessing
+import resource
+import sys
+from timeit import default_timer
+
+try:
+    from queue import Empty
+except ImportError:
+    # Python 2
+    from Queue import Empty
+
+from .queens import queen, queen_permut, nb_solutions, queen_bitmask
+from .queens import nb_solutions_bitmask, nb_solutions_parallel
+from .queens import nb_solutions_frontier, queen_batches
+from .util.logger import format_duration, format_size
+
+
+def _count(generator):
+    nb = 0
+    for _ in generator:
+        nb += 1
+    return nb
+
+
+def _count_batches(N):
+    nb = 0
+    for block in queen_batches(N):
+        nb += len(block)
+    return nb
+
+
+# The solvers, by name: (function of N returning the number of solutions,
+# largest N worth timing)
+SOLVERS = {
+    "queen": (lambda N: _count(queen(N)), 10),
+    "queen_permut": (lambda N: _count(queen_permut(N)), 9),
+    "nb_solutions": (nb_solutions, 9),
+    "queen_bitmask": (lambda N: _count(queen_bitmask(N)), 13),
+    "queen_batches": (_count_batches, 13),
+    "bitmask": (nb_solutions_bitmask, 14),
+    "symmetry": (lambda N: nb_solutions_bitmask(N, symmetry=True), 15),
+    "parallel": (nb_solutions_parallel, 15),
+    "frontier": (nb_solutions_frontier, 14),
+}
+
+# Version of the results file format
+FORMAT_VERSION = 1
+
+
+def _peak_memory():
+    """Peak resident memory of the process, in bytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak
+    return peak*1024
+
+
+def _timed_run(solver, N, queue):
+    """Child process: run the solver once and send back the measures"""
+    base = _peak_memory()
+    start = default_timer()
+    nb = SOLVERS[solver][0](N)
+    duration = default_timer() - start
+    queue.put((nb, duration, _peak_memory() - base))
+
+
+def _wait_result(process, queue, poll=0.1):
+    """
+    Wait for the measures of the child process (None if it exited without
+    sending them)
+    """
+    while True:
+        try:
+            return queue.get(timeout=poll)
+        except Empty:
+            if not process.is_alive():
+                break
+    # The measures may have been sent right before the child exited
+    try:
+        return queue.get(timeout=poll)
+    except Empty:
+        return None
+
+
+def time_solver(solver, N, repeat=3):
+    """
+    Time a solver on a board, each run in a fresh process
+
+    Parameters
+    ----------
+    solver : str
+        The name of the solver (a key of :data:`SOLVERS`)
+    N : int
+        The size of the board
+    repeat : int (Default : 3)
+        The number of runs
+
+    Return
+    ------
+    record : dict
+        The solver, N, the number of solutions, the wall times of the runs
+        and the best of them (in seconds), the solutions per second of
+        the best run, and the largest peak memory increase (in bytes)
+
+    Raise
+    -----
+    RuntimeError
+        If a run exits without a result (exception, killed process...)
+    """
+    times = []
+    peak = 0
+    nb = None
+    for _ in range(repeat):
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_timed_run,
+                                          args=(solver, N, queue))
+        process.start()
+        result = _wait_result(process, queue)
+        process.join()
+        if result is None:
+            raise RuntimeError("%s failed on N=%d (exit code %s)" %
+                               (solver, N, process.exitcode))
+        nb, duration, memory = result
+        times.append(duration)
+        peak = max(peak, memory)
+    best = min(times)
+    return {"solver": solver,
+            "N": N,
+            "solutions": nb,
+            "times": times,
+            "best": best,
+            "solutions_per_sec": nb / best if best > 0 else None,
+            "peak_memory": peak}
+
+
+def run_benchmark(solvers, sizes, repeat=3, log_func=None):
+    """
+    Time each solver on each size (up to the largest size of the solver)
+
+    Return
+    ------
+    records : list of dict
+        See :func:`time_solver`
+    """
+    records = []
+    for solver in solvers:
+        max_n = SOLVERS[solver][1]
+        for N in sizes:
+            if N > max_n:
+                continue
+            record = time_solver(solver, N, repeat)
+            records.append(record)
+            if log_func is not None:
+                log_func("%-14s N=%-3d %s (%s)" %
+                         (solver, N, format_duration(record["best"]),
+                          format_size(record["peak_memory"])))
+    return records
+
+
+def save_results(records, path):
+    """Write the records to a JSON file"""
+    with open(path, "w") as hdl:
+        json.dump({"version": FORMAT_VERSION, "results": records}, hdl,
+                  indent=1, sort_keys=True)
+
+
+def load_results(path):
+    """Read the records from a JSON file"""
+    with open(path) as hdl:
+        content = json.load(hdl)
+    if content.get("version") != FORMAT_VERSION:
+        raise ValueError("Unsupported results format in '%s'" % path)
+    return content["results"]
+
+
+def compare(records, baseline, threshold=0.2):
+    """
+    Find the regressions with respect to a baseline
+
+    Parameters
+    ----------
+    records : list of dict
+        The new results
+    baseline : list of dict
+        The reference results
+    threshold : float (Default : 0.2)
+        The relative slowdown of the best time above which a result is
+        flagged
+
+    Return
+    ------
+    regressions : list of (solver, N, baseline time, new time) tuples
+        The results slower than the baseline by more than `threshold`
+        (only the (solver, N) pairs in both lists are compared)
+    """
+    reference = dict(((r["solver"], r["N"]), r["best"]) for r in baseline)
+    regressions = []
+    for record in records:
+        key = (record["solver"], record["N"])
+        if key not in reference:
+            continue
+        if record["best"] > reference[key]*(1 + threshold):
+            regressions.append(key + (reference[key], record["best"]))
+    return regressions
+
+
+def _print(msg):
+    sys.stdout.write(msg + "\n")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser("Benchmark the N-queens solvers")
+    parser.add_argument("min_n", type=int, help="The smallest board size")
+    parser.add_argument("max_n", type=int, help="The largest board size")
+    parser.add_argument("-s", "--solvers",
+                        nargs="+",
+                        choices=sorted(SOLVERS),
+                        default=sorted(SOLVERS),
+                        help="The solvers to time (default: all)")
+    parser.add_argument("-r", "--repeat",
+                        type=int,
+                        default=3,
+                        help="The number of runs per solver and size")
+    parser.add_argument("-o", "--output",
+                        help="The JSON file to write the results to")
+    parser.add_argument("-b", "--baseline",
+                        help="A JSON results file to compare with")
+    parser.add_argument("-t", "--threshold",
+                        type=float,
+                        default=0.2,
+                        help="The relative slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    records = run_benchmark(args.solvers, range(args.min_n, args.max_n+1),
+                            args.repeat, _print)
+    if args.output is not None:
+        save_results(records, args.output)
+    if args.baseline is not None:
+        regressions = compare(records, load_results(args.baseline),
+                              args.threshold)
+        for solver, N, before, after in regressions:
+            _print("REGRESSION %s N=%d: %s -> %s" %
+                   (solver, N, format_duration(before),
+                    format_duration(after)))
+        if regressions:
+            sys.exit(1)
@@ -8,14 +8,39 @@ __author__ = "Begon Jean-Michel <jm.begon@gmail.com>"
 __copyright__ = "3-clause BSD License"
 __version__ = 'dev'
 
-from itertools import permutations
+from array import array
+from itertools import islice, permutations
+import json
+import multiprocessing
+import os
+import random
+import struct
 import sys
+import tempfile
+import time
+
+import numpy as np
+
+try:
+    from . import _queens
+except (ImportError, ValueError):
+    # Not built (or run as a script): pure Python only
+    _queens = None
+
+# Largest board the compiled loops can handle (64 bits masks)
+_MAX_COMPILED_N = 63
 
 def check_queen(B):
     """Check whether the N-queens problem is solved or not"""
+    if _queens is not None:
+        return _queens.check_queen(B)
+    return _check_queen(B)
+
+def _check_queen(B):
+    """Pure Python version of :func:`check_queen`"""
     line = [False]*len(B)
     for i in range(len(B)):
-        if line[B[i]]:
+        if B[i] < 0 or B[i] >= len(B) or line[B[i]]:
             return False
         line[B[i]] = True
     diag1 = [False]*(len(B)*2)
@@ -29,6 +54,145 @@ def check_queen(B):
         diag2[d2] = True
     return True
 
+def _check_queens_chunk(boards):
+    """Vectorized :func:`check_queen` over the rows of a 2D array"""
+    N = boards.shape[1]
+    valid = np.all((boards >= 0) & (boards < N), axis=1)
+    offsets = np.arange(N)
+    for lines in (boards, boards - offsets, boards + offsets):
+        lines = np.sort(lines, axis=1)
+        valid &= np.all(lines[:, 1:] != lines[:, :-1], axis=1)
+    return valid
+
+
+def check_queens(boards, chunk_size=None):
+    """
+    Check a batch of boards at once
+
+    Parameters
+    ----------
+    boards : array-like of int, shape = (M, N)
+        The state vectors of the M boards
+    chunk_size : int or None (Default : None)
+        The number of boards processed at once (None for about a million
+        cells per chunk). Bounds the size of the temporaries.
+
+    Return
+    ------
+    valid : array of bool, shape = (M,)
+        Whether each board solves the N-queens problem
+    """
+    boards = np.asarray(boards)
+    if boards.ndim != 2:
+        raise ValueError("Expected a 2D array of boards, got shape %s"
+                         % str(boards.shape))
+    M, N = boards.shape
+    if chunk_size is None:
+        chunk_size = max(1, 2**20 // max(N, 1))
+    valid = np.empty(M, dtype=bool)
+    for start in range(0, M, chunk_size):
+        end = min(M, start + chunk_size)
+        valid[start:end] = _check_queens_chunk(boards[start:end])
+    return valid
+
+
+class Board(object):
+    """
+    =====
+    Board
+    =====
+    A :class:`Board` is an incremental N-queens state: it holds at most
+    one queen per column and keeps occupancy counters for the rows and
+    both diagonal families so that placing, removing and checking a
+    queen are all O(1).
+
+    Instance attributes
+    -------------------
+    N : int
+        The size of the board
+
+    Constructor parameters
+    ----------------------
+    N : int
+        The size of the board
+    """
+    __slots__ = ("N", "_B", "_rows", "_diag1", "_diag2", "_conflicts")
+
+    EMPTY = -1
+
+    def __init__(self, N):
+        self.N = N
+        self._B = array("i", [Board.EMPTY])*N
+        self._rows = array("i", [0])*N
+        self._diag1 = array("i", [0])*(2*N)
+        self._diag2 = array("i", [0])*(2*N)
+        # Number of pairs of queens attacking each other
+        self._conflicts = 0
+
+    def __len__(self):
+        return self.N
+
+    def __getitem__(self, i):
+        """Return the row of the queen in column i (EMPTY if none)"""
+        return self._B[i]
+
+    def is_safe(self, i, r):
+        """Whether a queen in column i, row r would be attacked"""
+        return (self._rows[r] == 0 and
+                self._diag1[r - i + self.N] == 0 and
+                self._diag2[r + i] == 0)
+
+    def place(self, i, r):
+        """Put a queen in (empty) column i, row r"""
+        if not 0 <= i < self.N:
+            raise ValueError("Column %d is out of the board" % i)
+        if self._B[i] != Board.EMPTY:
+            raise ValueError("Column %d is already occupied" % i)
+        if not 0 <= r < self.N:
+            raise ValueError("Row %d is out of the board" % r)
+        d1 = r - i + self.N
+        d2 = r + i
+        self._conflicts += self._rows[r] + self._diag1[d1] + self._diag2[d2]
+        self._rows[r] += 1
+        self._diag1[d1] += 1
+        self._diag2[d2] += 1
+        self._B[i] = r
+
+    def remove(self, i):
+        """Take the queen out of column i and return its row"""
+        if not 0 <= i < self.N:
+            raise ValueError("Column %d is out of the board" % i)
+        r = self._B[i]
+        if r == Board.EMPTY:
+            raise ValueError("Column %d is empty" % i)
+        d1 = r - i + self.N
+        d2 = r + i
+        self._rows[r] -= 1
+        self._diag1[d1] -= 1
+        self._diag2[d2] -= 1
+        self._conflicts -= self._rows[r] + self._diag1[d1] + self._diag2[d2]
+        self._B[i] = Board.EMPTY
+        return r
+
+    def move(self, i, r):
+        """Move the queen of column i (if any) to row r"""
+        if self._B[i] != Board.EMPTY:
+            self.remove(i)
+        self.place(i, r)
+
+    def is_valid(self):
+        """Whether no two queens on the board attack each other"""
+        return self._conflicts == 0
+
+    def is_solved(self):
+        """Whether the N-queens problem is solved"""
+        return self._conflicts == 0 and Board.EMPTY not in self._B
+
+    def to_tuple(self):
+        """Return the state vector of the board"""
+        return tuple(self._B)
+
+
 def print_queen(B):
     """Prints the board"""
     N = len(B)    
@@ -63,11 +227,37 @@ def inc_queen(B, p):
 
 
 def queen(N):
-    """Generator for N-queens problem (all configuration)"""
+    """
+    Generator for N-queens problem (all configuration)
+
+    Walks the N**N state vectors in order like an odometer, but skips all
+    the vectors sharing a prefix as soon as the last queen of the prefix
+    is attacked. The same list is yielded (and updated) each time.
+    """
     B = [0]*N
-    while inc_queen(B, N-1):
-        if check_queen(B):
+    if N <= 0:
+        yield B
+        return
+    board = Board(N)
+    i = 0  # Columns before i are on the board, digits after i are 0
+    while i >= 0:
+        if i == N:
             yield B
+            i -= 1
+            board.remove(i)
+        elif board.is_safe(i, B[i]):
+            board.place(i, B[i])
+            i += 1
+            continue
+        # Increment digit i, carrying over to the previous ones
+        while i >= 0:
+            B[i] += 1
+            if B[i] < N:
+                break
+            B[i] = 0
+            i -= 1
+            if i >= 0:
+                board.remove(i)
 
 
 #----------------------Generate only the permutations------------
@@ -75,20 +265,1090 @@ def queen(N):
 def queen_permut(N):
     """Generator for the N-queens problem (permutation only)"""
     for B in permutations(range(N)):
-        if check_queen(B):
+        if _check_queen(B):
             yield B
 
 
+#----------------------Resumable enumeration by rank--------------
+
+def _factorial(n):
+    f = 1
+    for k in range(2, n+1):
+        f *= k
+    return f
+
+
+def permutation_rank(P):
+    """Return the rank of the permutation P of range(len(P)) (lex. order)"""
+    N = len(P)
+    rank = 0
+    for i in range(N):
+        smaller = 0
+        for j in range(i+1, N):
+            if P[j] < P[i]:
+                smaller += 1
+        rank = rank*(N - i) + smaller
+    return rank
+
+
+def permutation_unrank(N, rank):
+    """Return the permutation of range(N) of given rank (lex. order)"""
+    if not 0 <= rank < _factorial(N):
+        raise ValueError("Rank %d out of range for %d elements" % (rank, N))
+    digits = []
+    for base in range(1, N+1):
+        rank, digit = divmod(rank, base)
+        digits.append(digit)
+    remaining = list(range(N))
+    return [remaining.pop(d) for d in reversed(digits)]
+
+
+def _next_permutation(P):
+    """Rearrange P into the next permutation, return False if it was last"""
+    i = len(P) - 2
+    while i >= 0 and P[i] >= P[i+1]:
+        i -= 1
+    if i < 0:
+        return False
+    j = len(P) - 1
+    while P[j] <= P[i]:
+        j -= 1
+    P[i], P[j] = P[j], P[i]
+    P[i+1:] = P[:i:-1]
+    return True
+
+
+def _first_conflict(P):
+    """Index of the first queen attacked by a previous one (None if none)"""
+    diag1 = set()
+    diag2 = set()
+    for i in range(len(P)):
+        d1 = P[i] - i
+        d2 = P[i] + i
+        if d1 in diag1 or d2 in diag2:
+            return i
+        diag1.add(d1)
+        diag2.add(d2)
+    return None
+
+
+class QueenPermutations(object):
+    """
+    =================
+    QueenPermutations
+    =================
+    A :class:`QueenPermutations` iterates over the solutions whose rank,
+    as permutations of range(N) in lexicographic order, lies in
+    [start, stop). The solutions come in the same order as with
+    :func:`queen_permut`, but the permutations sharing a conflicting
+    prefix are skipped at once.
+
+    The :attr:`rank` attribute is a checkpoint: a new instance created
+    with `start=rank` yields exactly the solutions that this one has not
+    yielded yet. Splitting [0, N!) into ranges thus shards a run.
+
+    Constructor parameters
+    ----------------------
+    N : int
+        The size of the board
+    start : int (Default : 0)
+        The rank of the first permutation to examine
+    stop : int or None (Default : None)
+        The rank of the first permutation not to examine (None for N!)
+    """
+
+    def __init__(self, N, start=0, stop=None):
+        self.N = N
+        self.start = start
+        self.stop = _factorial(N) if stop is None else stop
+        self._stop_perm = None
+        if self.stop < _factorial(N):
+            self._stop_perm = permutation_unrank(N, self.stop)
+        self._P = None
+        if start < self.stop:
+            self._P = permutation_unrank(N, start)
+
+    @property
+    def rank(self):
+        """The rank of the next permutation to examine"""
+        if self._P is None:
+            return self.stop
+        return min(permutation_rank(self._P), self.stop)
+
+    def __iter__(self):
+        P = self._P
+        while P is not None:
+            if self._stop_perm is not None and P >= self._stop_perm:
+                break
+            k = _first_conflict(P)
+            if k is None:
+                B = tuple(P)
+                if not _next_permutation(P):
+                    self._P = None
+                yield B
+                P = self._P
+                continue
+            # Jump past the permutations starting with P[:k+1]
+            P[k+1:] = sorted(P[k+1:], reverse=True)
+            if not _next_permutation(P):
+                break
+        self._P = None
+
+
 #------------------------Only yield the number of solutions----------
 def nb_solutions(N):
     """Return the number of solutions for the size N"""
     nb = 0
     for B in permutations(range(N)):
-        if check_queen(B):
+        if _check_queen(B):
             nb += 1
     return nb
 
 
+#----------------------Backtracking over bitmasks-----------------
+# The occupied rows and both diagonal families are held as integer bitmasks
+# relative to the column being filled: bit r of `cols` is set if row r is
+# taken, bit r of `diag1` (resp. `diag2`) if the square at row r of the
+# current column is attacked along a rising (resp. falling) diagonal.
+# Moving to the next column shifts `diag1` up and `diag2` down.
+
+def _count_bitmask(full, cols, diag1, diag2):
+    """Count the completions of the partial board described by the masks"""
+    if cols == full:
+        return 1
+    nb = 0
+    avail = full & ~(cols | diag1 | diag2)
+    while avail:
+        bit = avail & -avail
+        avail ^= bit
+        nb += _count_bitmask(full, cols | bit,
+                             ((diag1 | bit) << 1) & full,
+                             (diag2 | bit) >> 1)
+    return nb
+
+
+def _count_completions(full, cols, diag1, diag2):
+    """Same as :func:`_count_bitmask`, compiled if possible"""
+    if _queens is not None and full.bit_length() <= _MAX_COMPILED_N:
+        return _queens.count_bitmask(full, cols, diag1, diag2)
+    return _count_bitmask(full, cols, diag1, diag2)
+
+
+def _iter_bitmask(N, first, copy=True):
+    """
+    Backtracking generator whose first queen is restricted to `first`
+
+    If `copy` is False, the same list is yielded (and updated) each time
+    """
+    if N <= 0:
+        yield ()
+        return
+    full = (1 << N) - 1
+    B = [0]*N
+    cols = [0]*N
+    diag1 = [0]*N
+    diag2 = [0]*N
+    avails = [0]*N
+    avails[0] = first & full
+    i = 0
+    while i >= 0:
+        avail = avails[i]
+        if not avail:
+            i -= 1
+            continue
+        bit = avail & -avail
+        avails[i] = avail ^ bit
+        B[i] = bit.bit_length() - 1
+        if i == N-1:
+            yield tuple(B) if copy else B
+            continue
+        c = cols[i] | bit
+        d1 = ((diag1[i] | bit) << 1) & full
+        d2 = (diag2[i] | bit) >> 1
+        i += 1
+        cols[i], diag1[i], diag2[i] = c, d1, d2
+        avails[i] = full & ~(c | d1 | d2)
+
+
+def queen_bitmask(N):
+    """
+    Generator for the N-queens problem (backtracking)
+
+    Yields the same tuples, in the same (lexicographic) order, as
+    :func:`queen_permut` but prunes a partial board as soon as two of
+    its queens attack each other.
+    """
+    return _iter_bitmask(N, (1 << N) - 1 if N > 0 else 0)
+
+
+def queen_batches(N, batch_size=4096, reuse=True, dtype=np.int32):
+    """
+    Generator for the N-queens problem (by blocks of solutions)
+
+    The solutions of :func:`queen_bitmask` are written, in the same order,
+    in the rows of a preallocated (batch_size, N) array and yielded as
+    views of it. All the views are full but the last one.
+
+    Parameters
+    ----------
+    N : int
+        The size of the board
+    batch_size : int (Default : 4096)
+        The number of solutions per block
+    reuse : bool (Default : True)
+        If True, the same buffer is refilled for each block, so that a
+        block is only valid until the next one is requested. If False,
+        each block is a fresh buffer handed over to the caller.
+    dtype : numpy dtype (Default : np.int32)
+        The type of the array
+
+    Yield
+    -----
+    block : array of shape (k, N)
+        The next k solutions
+    """
+    buf = np.empty((batch_size, N), dtype=dtype)
+    k = 0
+    for B in _iter_bitmask(N, (1 << N) - 1 if N > 0 else 0, copy=False):
+        buf[k] = B
+        k += 1
+        if k == batch_size:
+            yield buf
+            if not reuse:
+                buf = np.empty((batch_size, N), dtype=dtype)
+            k = 0
+    if k > 0:
+        yield buf[:k]
+
+
+def _count_symmetric(N):
+    """Count the solutions by exploring half of the first column"""
+    full = (1 << N) - 1
+    half = N // 2
+    nb = 0
+    for r in range(half):
+        bit = 1 << r
+        nb += _count_completions(full, bit, (bit << 1) & full, bit >> 1)
+    nb *= 2
+    if N % 2 == 1:
+        if N == 1:
+            return nb + 1
+        # Queen in the middle row: the mirror image of a solution still
+        # starts in the middle, so restrict the second queen instead
+        bit = 1 << half
+        cols, diag1, diag2 = bit, (bit << 1) & full, bit >> 1
+        avail = full & ~(cols | diag1 | diag2) & ((1 << half) - 1)
+        while avail:
+            bit = avail & -avail
+            avail ^= bit
+            nb += 2*_count_completions(full, cols | bit,
+                                       ((diag1 | bit) << 1) & full,
+                                       (diag2 | bit) >> 1)
+    return nb
+
+
+def nb_solutions_bitmask(N, symmetry=False):
+    """
+    Return the number of solutions for the size N (backtracking)
+
+    If `symmetry` is True, only half of the placements of the first queen
+    are explored and the count is doubled by the mirror symmetry.
+    """
+    if N <= 0:
+        return 1
+    if symmetry:
+        return _count_symmetric(N)
+    return _count_completions((1 << N) - 1, 0, 0, 0)
+
+
+#----------------------Breadth-first counting over bitboards-------
+# A frontier of partial boards with the same number of queens is held as
+# three uint64 arrays (the masks of the backtracking) and expanded one
+# row index at a time for all the boards at once.
+
+def _expand_frontier(full, avail, cols, diag1, diag2, N):
+    """Return the masks of all the children of the frontier"""
+    one = np.uint64(1)
+    children = ([], [], [])
+    for r in range(N):
+        bit = np.uint64(1 << r)
+        keep = (avail & bit) != 0
+        if not keep.any():
+            continue
+        children[0].append(cols[keep] | bit)
+        children[1].append(((diag1[keep] | bit) << one) & full)
+        children[2].append((diag2[keep] | bit) >> one)
+    if not children[0]:
+        empty = np.zeros(0, dtype=np.uint64)
+        return empty, empty, empty
+    return tuple(np.concatenate(c) for c in children)
+
+
+def _popcounts(avail, N):
+    """Number of bits set in each element of the array"""
+    one = np.uint64(1)
+    counts = np.zeros(len(avail), dtype=np.intp)
+    for r in range(N):
+        counts += ((avail >> np.uint64(r)) & one).astype(np.intp)
+    return counts
+
+
+def _count_frontier(full, frontier, level, N, max_frontier, stats):
+    cols, diag1, diag2 = frontier
+    avail = full & ~(cols | diag1 | diag2)
+    counts = _popcounts(avail, N)
+    if level == N-1:
+        # The last queen: count the free squares of each board
+        return int(counts.sum())
+    # Expand the boards a slice at a time, each slice having at most
+    # max_frontier children (but at least one parent board), and go on
+    # depth-first with each slice of children
+    ends = np.cumsum(counts)
+    nb = 0
+    lo = 0
+    while lo < len(cols):
+        base = ends[lo-1] if lo > 0 else 0
+        hi = int(np.searchsorted(ends, base + max_frontier, side="right"))
+        hi = max(hi, lo + 1)
+        start = time.time()
+        children = _expand_frontier(full, avail[lo:hi], cols[lo:hi],
+                                    diag1[lo:hi], diag2[lo:hi], N)
+        stats[level+1][0] += len(children[0])
+        stats[level+1][1] += time.time() - start
+        if len(children[0]) > 0:
+            nb += _count_frontier(full, children, level+1, N, max_frontier,
+                                  stats)
+        lo = hi
+    return nb
+
+
+def nb_solutions_frontier(N, max_frontier=1 << 20, stats=None):
+    """
+    Return the number of solutions for the size N (breadth-first)
+
+    The partial boards are expanded level by level with vectorized bit
+    operations on uint64 masks. Whenever a level would hold more than
+    `max_frontier` boards, the level above is expanded a slice at a time
+    and each slice of children is processed depth-first.
+
+    Parameters
+    ----------
+    N : int <= 64
+        The size of the board
+    max_frontier : int (Default : 2**20)
+        The maximum number of boards built at once on a level (the
+        children of a single board are never split, so that a level may
+        hold up to N boards if `max_frontier` < N). A level only holds
+        one slice at a time, so that at most N*`max_frontier` boards
+        (24 bytes each) are alive at once.
+    stats : list or None (Default : None)
+        If a list, it is filled with a (number of queens, number of
+        partial boards, duration in seconds) tuple per level
+
+    Return
+    ------
+    nb : int
+        The number of solutions
+    """
+    if N > 64:
+        raise ValueError("Bitboards are limited to N <= 64, got %d" % N)
+    if N <= 0:
+        return 1
+    full = np.uint64((1 << N) - 1)
+    root = tuple(np.zeros(1, dtype=np.uint64) for _ in range(3))
+    levels = [[0, 0.0] for _ in range(N)]
+    levels[0][0] = 1
+    nb = _count_frontier(full, root, 0, N, max_frontier, levels)
+    if stats is not None:
+        stats.extend((level, size, duration) for level, (size, duration)
+                     in enumerate(levels))
+    return nb
+
+
+#----------------------Completion of a partial board---------------
+
+def _completion_masks(partial):
+    """
+    Return the (column, mask of the rows allowed, number of rows allowed)
+    triplets of the free columns given the fixed queens of `partial` (None
+    if the fixed queens attack each other)
+    """
+    N = len(partial)
+    full = (1 << N) - 1
+    fixed = [(j, r) for j, r in enumerate(partial) if r is not None]
+    # Same bookkeeping as check_queen, on the fixed queens only
+    line = [False]*N
+    diag1 = [False]*(N*2)
+    diag2 = [False]*(N*2)
+    for j, r in fixed:
+        if not 0 <= r < N:
+            raise ValueError("Row %d out of range in column %d" % (r, j))
+        d1 = r - j + N
+        d2 = r + j
+        if line[r] or diag1[d1] or diag2[d2]:
+            return None
+        line[r] = diag1[d1] = diag2[d2] = True
+    rows = 0
+    for r in range(N):
+        if not line[r]:
+            rows |= 1 << r
+    free = []
+    for i in range(N):
+        if partial[i] is not None:
+            continue
+        mask = rows
+        for r in range(N):
+            if diag1[r - i + N] or diag2[r + i]:
+                mask &= ~(1 << r)
+        free.append((i, mask, _popcount(mask)))
+    return free
+
+
+def _popcount(x):
+    return bin(x).count("1")
+
+
+def _restrict(free, i, r):
+    """
+    Remove the squares attacked by a queen in (i, r) from the masks of
+    the free columns (None as soon as one of them has no row left)
+    """
+    res = []
+    row = 1 << r
+    for j, mask, count in free:
+        delta = abs(j - i)
+        # At most three squares attacked per column: update the count
+        # rather than recomputing it
+        for bit in (row, row << delta, row >> delta):
+            if mask & bit:
+                mask ^= bit
+                count -= 1
+        if not count:
+            return None
+        res.append((j, mask, count))
+    return res
+
+
+def _branch(free):
+    """
+    Pick the most constrained free column: return the frame (column,
+    the other free columns, rows left to try)
+    """
+    k = min(range(len(free)), key=lambda k: free[k][2])
+    i, avail, _ = free[k]
+    return [i, free[:k] + free[k+1:], avail]
+
+
+def _iter_completions(free, B):
+    """
+    Fill the free columns of B, most constrained column first, and yield
+    B each time it is complete
+    """
+    if not free:
+        yield B
+        return
+    stack = [_branch(free)]
+    while stack:
+        frame = stack[-1]
+        i, others, avail = frame
+        if not avail:
+            B[i] = None
+            stack.pop()
+            continue
+        bit = avail & -avail
+        frame[2] = avail ^ bit
+        r = bit.bit_length() - 1
+        remaining = _restrict(others, i, r)
+        if remaining is None:
+            continue
+        B[i] = r
+        if remaining:
+            stack.append(_branch(remaining))
+        else:
+            yield B
+
+
+def queen_completions(partial):
+    """
+    Generator of the solutions agreeing with a partial board
+
+    The free columns are filled most constrained first, each placement
+    removing the attacked squares of the remaining ones (forward
+    checking), so that the solutions do not come in lexicographic order.
+
+    Parameters
+    ----------
+    partial : sequence of int or None
+        The state vector of the fixed queens, None for a free column
+
+    Yield
+    -----
+    B : tuple of int
+        The solutions extending `partial`
+    """
+    free = _completion_masks(partial)
+    if free is None or not all(count for _, _, count in free):
+        return
+    for B in _iter_completions(free, list(partial)):
+        yield tuple(B)
+
+
+def _count_completions_free(free):
+    """Count the ways to fill the free columns (see _iter_completions)"""
+    if not free:
+        return 1
+    nb = 0
+    stack = [_branch(free)]
+    while stack:
+        frame = stack[-1]
+        i, others, avail = frame
+        if not avail:
+            stack.pop()
+            continue
+        bit = avail & -avail
+        frame[2] = avail ^ bit
+        remaining = _restrict(others, i, bit.bit_length() - 1)
+        if remaining is None:
+            continue
+        if remaining:
+            stack.append(_branch(remaining))
+        else:
+            nb += 1
+    return nb
+
+
+def nb_completions(partial):
+    """Return the number of solutions agreeing with a partial board"""
+    free = _completion_masks(partial)
+    if free is None or not all(count for _, _, count in free):
+        return 0
+    return _count_completions_free(free)
+
+
+#----------------------Parallel counting--------------------------
+
+def _expand_prefixes(full, prefixes):
+    """Extend each (cols, diag1, diag2) partial board by one queen"""
+    res = []
+    for cols, diag1, diag2 in prefixes:
+        avail = full & ~(cols | diag1 | diag2)
+        while avail:
+            bit = avail & -avail
+            avail ^= bit
+            res.append((cols | bit, ((diag1 | bit) << 1) & full,
+                        (diag2 | bit) >> 1))
+    return res
+
+
+def _count_prefix(args):
+    """Pool task: count the completions of a single prefix"""
+    full, cols, diag1, diag2 = args
+    return _count_completions(full, cols, diag1, diag2)
+
+
+def nb_solutions_parallel(N, n_jobs=None, depth=None):
+    """
+    Return the number of solutions for the size N (multiprocess)
+
+    The search space is split into the valid placements of the first
+    `depth` queens, which are counted independently by a pool of
+    processes. Prefixes are handed out one at a time so that idle workers
+    pick up the remaining ones as the others are busy.
+
+    Parameters
+    ----------
+    N : int
+        The size of the board
+    n_jobs : int or None (Default : None)
+        The number of processes (None for as many as CPUs)
+    depth : int or None (Default : None)
+        The number of queens in a prefix (None to choose it so that there
+        are about ten prefixes per process)
+
+    Return
+    ------
+    nb : int
+        The number of solutions, exactly that of :func:`nb_solutions`
+    """
+    if n_jobs is None:
+        n_jobs = multiprocessing.cpu_count()
+    if N <= 0 or n_jobs <= 1:
+        return nb_solutions_bitmask(N)
+    full = (1 << N) - 1
+    prefixes = [(0, 0, 0)]
+    level = 0
+    while level < N and prefixes:
+        if depth is None and len(prefixes) >= 10*n_jobs:
+            break
+        if depth is not None and level >= depth:
+            break
+        prefixes = _expand_prefixes(full, prefixes)
+        level += 1
+    tasks = [(full, c, d1, d2) for c, d1, d2 in prefixes]
+    pool = multiprocessing.Pool(n_jobs)
+    try:
+        nb = sum(pool.imap_unordered(_count_prefix, tasks, chunksize=1))
+    finally:
+        pool.terminate()
+    return nb
+
+
+#----------------------Symmetries of the board-------------------
+
+def _inverse(B):
+    """Return the transposed board"""
+    T = [0]*len(B)
+    for i in range(len(B)):
+        T[B[i]] = i
+    return tuple(T)
+
+
+def symmetries(B):
+    """
+    Generator of the eight images of B under the symmetries of the square
+
+    Some of the images may coincide for symmetric boards
+    """
+    N = len(B)
+    for C in (tuple(B), _inverse(B)):
+        yield C
+        yield C[::-1]
+        yield tuple(N-1-r for r in C)
+        yield tuple(N-1-r for r in reversed(C))
+
+
+def orbit(B):
+    """Generator of the distinct boards equivalent to B (B included)"""
+    seen = set()
+    for C in symmetries(B):
+        if C not in seen:
+            seen.add(C)
+            yield C
+
+
+def is_fundamental(B):
+    """Whether B is the smallest (lexicographically) board of its orbit"""
+    B = tuple(B)
+    return B == min(symmetries(B))
+
+
+def queen_unique(N):
+    """
+    Generator for the N-queens problem (fundamental solutions only)
+
+    Each class of solutions equivalent up to rotations and reflections
+    is represented once, by its lexicographically smallest member.
+    """
+    # The mirror image of B starts at N-1-B[0] so that the smallest member
+    # of an orbit starts in the upper half of the first column
+    for B in _iter_bitmask(N, (1 << ((N+1)//2)) - 1):
+        if is_fundamental(B):
+            yield B
+
+
+def nb_unique_solutions(N):
+    """Return the number of fundamental solutions for the size N"""
+    nb = 0
+    for _ in queen_unique(N):
+        nb += 1
+    return nb
+
+
+def queen_orbits(N):
+    """
+    Generator for the N-queens problem (all solutions, orbit by orbit)
+
+    Each fundamental solution is expanded lazily into its orbit so that
+    the whole solution set is never held in memory.
+    """
+    for B in queen_unique(N):
+        for C in orbit(B):
+            yield C
+
+
+#----------------------Local search for a single solution--------
+# The board is kept a permutation (one queen per row and per column) and
+# repaired by swapping the rows of two queens, so that only the diagonals
+# can be in conflict. Each swap is evaluated in O(1) from the diagonal
+# counters.
+
+def _attacks(B, diag1, diag2, N, i):
+    """Number of queens attacking the one of column i"""
+    r = B[i]
+    return diag1[r - i + N] + diag2[r + i] - 2
+
+
+def _greedy_permutation(N, rng, tries):
+    """
+    Random permutation built column by column, swapping in a row free of
+    diagonal conflicts whenever one is found within `tries` draws
+    """
+    B = np.arange(N, dtype=np.int32)
+    diag1 = np.zeros(2*N + 1, dtype=np.int32)
+    diag2 = np.zeros(2*N + 1, dtype=np.int32)
+    for i in range(N):
+        j = i
+        for _ in range(tries):
+            j = rng.randrange(i, N)
+            r = B[j]
+            if diag1[r - i + N] == 0 and diag2[r + i] == 0:
+                break
+        B[i], B[j] = B[j], B[i]
+        r = B[i]
+        diag1[r - i + N] += 1
+        diag2[r + i] += 1
+    return B, diag1, diag2
+
+
+def min_conflicts(N, max_iter=None, seed=None, greedy_tries=64):
+    """
+    Find one solution of the N-queens problem by local search
+
+    A random permutation is first made greedily conflict-free as far as
+    possible, then conflicted queens are swapped with random ones as long
+    as this does not increase the number of attacking pairs. The search
+    restarts from a new permutation when it stalls.
+
+    Parameters
+    ----------
+    N : int
+        The size of the board
+    max_iter : int or None (Default : None)
+        The maximum number of repair steps (None for no limit)
+    seed : int or None (Default : None)
+        The seed of the random generator
+    greedy_tries : int (Default : 64)
+        The number of random rows tried per column during the greedy
+        initialization
+
+    Return
+    ------
+    B : tuple of int or None
+        A solution, or None if none was found within `max_iter` steps
+    """
+    if N in (2, 3):
+        return None
+    rng = random.Random(seed)
+    columns = np.arange(N)
+    stall_limit = max(100, 2*N)
+    it = 0
+    conflicted = True
+    while conflicted:
+        B, diag1, diag2 = _greedy_permutation(N, rng, greedy_tries)
+        attacked = (diag1[B - columns + N] > 1) | (diag2[B + columns] > 1)
+        conflicted = np.flatnonzero(attacked).tolist()
+        conflicts = int(((diag1*(diag1 - 1)).sum() +
+                         (diag2*(diag2 - 1)).sum()) // 2)
+        best = conflicts
+        stall = 0
+        while conflicted and stall < stall_limit:
+            if max_iter is not None and it >= max_iter:
+                return None
+            it += 1
+            stall += 1
+            k = rng.randrange(len(conflicted))
+            i = conflicted[k]
+            if _attacks(B, diag1, diag2, N, i) == 0:
+                conflicted[k] = conflicted[-1]
+                conflicted.pop()
+                attacked[i] = False
+                continue
+            j = rng.randrange(N)
+            if j == i:
+                continue
+            ri, rj = B[i], B[j]
+            before = (_attacks(B, diag1, diag2, N, i) +
+                      _attacks(B, diag1, diag2, N, j) -
+                      (ri - i == rj - j or ri + i == rj + j))
+            diag1[ri - i + N] -= 1
+            diag2[ri + i] -= 1
+            diag1[rj - j + N] -= 1
+            diag2[rj + j] -= 1
+            after = (diag1[rj - i + N] + diag2[rj + i] +
+                     diag1[ri - j + N] + diag2[ri + j] +
+                     (rj - i == ri - j or rj + i == ri + j))
+            if after <= before:
+                ri, rj = rj, ri
+                B[i], B[j] = ri, rj
+                conflicts += after - before
+                if conflicts < best:
+                    best = conflicts
+                    stall = 0
+                if not attacked[j] and after > 0:
+                    attacked[j] = True
+                    conflicted.append(j)
+            diag1[ri - i + N] += 1
+            diag2[ri + i] += 1
+            diag1[rj - j + N] += 1
+            diag2[rj + j] += 1
+
+    solution = tuple(B.tolist())
+    if not check_queen(solution):
+        raise RuntimeError("Local search ended on an invalid board")
+    return solution
+
+
+#------------------------Persistent cache of the counts---------------
+
+# Number of solutions for N = 0, 1, ... (OEIS A000170)
+KNOWN_NB_SOLUTIONS = (1, 1, 0, 0, 2, 10, 4, 40, 92, 352, 724, 2680, 14200,
+                      73712, 365596, 2279184, 14772512, 95815104,
+                      666090624, 4968057848, 39029188884, 314666222712,
+                      2691008701644, 24233937684440, 227514171973736,
+                      2207893435808352, 22317699616364044,
+                      234907967154122528)
+
+# The counting functions, by name of variant
+SOLVERS = {
+    "permut": nb_solutions,
+    "bitmask": nb_solutions_bitmask,
+    "symmetry": lambda N: nb_solutions_bitmask(N, symmetry=True),
+    "parallel": nb_solutions_parallel,
+}
+
+
+class SolutionCache(object):
+    """
+    =============
+    SolutionCache
+    =============
+    A :class:`SolutionCache` stores the number of solutions per size and
+    per solver variant in a JSON file. The file is rewritten atomically
+    (write to a temporary file, then rename) and holds at most a given
+    number of entries, the least recently used ones being evicted first.
+    A file written by another version of the format is ignored.
+
+    Class constants
+    ---------------
+    VERSION : int
+        The version of the file format
+
+    Constructor parameters
+    ----------------------
+    path : str or None (Default : None)
+        The path of the cache file (None for ~/.pythonsetup/queens.json)
+    max_entries : int (Default : 1024)
+        The maximum number of entries kept in the file
+    """
+    VERSION = 1
+
+    def __init__(self, path=None, max_entries=1024):
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".pythonsetup",
+                                "queens.json")
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = None
+        self._clock = 0
+
+    def _key(self, N, variant):
+        return "%s:%d" % (variant, N)
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        try:
+            with open(self.path) as hdl:
+                content = json.load(hdl)
+            if content.get("version") == SolutionCache.VERSION:
+                self._entries = dict((k, tuple(v)) for k, v in
+                                     content["entries"].items())
+        except (IOError, OSError, ValueError, KeyError, TypeError,
+                AttributeError):
+            pass
+        if self._entries:
+            self._clock = max(tick for _, tick in self._entries.values())
+        return self._entries
+
+    def _save(self):
+        entries = self._entries
+        if len(entries) > self.max_entries:
+            lru = sorted(entries, key=lambda k: entries[k][1])
+            for key in lru[:len(entries) - self.max_entries]:
+                del entries[key]
+        folder = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as hdl:
+                json.dump({"version": SolutionCache.VERSION,
+                           "entries": entries}, hdl)
+            if os.name == "nt" and os.path.exists(self.path):
+                os.remove(self.path)
+            os.rename(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, N, variant):
+        """Return the cached number of solutions (None if absent)"""
+        if 0 <= N < len(KNOWN_NB_SOLUTIONS):
+            return KNOWN_NB_SOLUTIONS[N]
+        entries = self._load()
+        key = self._key(N, variant)
+        if key not in entries:
+            return None
+        self._clock += 1
+        entries[key] = (entries[key][0], self._clock)
+        return entries[key][0]
+
+    def set(self, N, variant, nb):
+        """Store the number of solutions and write the cache file"""
+        entries = self._load()
+        self._clock += 1
+        entries[self._key(N, variant)] = (nb, self._clock)
+        self._save()
+
+    def __len__(self):
+        return len(self._load())
+
+
+def cached_nb_solutions(N, variant="bitmask", cache=None, force=False):
+    """
+    Return the number of solutions for the size N, through a cache
+
+    Parameters
+    ----------
+    N : int
+        The size of the board
+    variant : str (Default : "bitmask")
+        The solver to use on a cache miss (a key of :data:`SOLVERS`)
+    cache : :class:`SolutionCache` or None (Default : None)
+        The cache (None for the default one)
+    force : bool (Default : False)
+        Whether to recompute (and store) the number regardless of the cache
+
+    Return
+    ------
+    nb : int
+        The number of solutions
+    """
+    solver = SOLVERS[variant]
+    if cache is None:
+        cache = SolutionCache()
+    if not force:
+        nb = cache.get(N, variant)
+        if nb is not None:
+            return nb
+    nb = solver(N)
+    if N >= len(KNOWN_NB_SOLUTIONS):
+        # Smaller sizes are always answered from the table
+        cache.set(N, variant, nb)
+    return nb
+
+
+#------------------------Writing solutions in bulk-------------------
+
+# Size in bytes of the .npy header, room enough to rewrite the final shape
+_NPY_HEADER_SIZE = 128
+
+
+def _solution_dtype(N):
+    """Smallest (little-endian) integer type able to hold a row index"""
+    for dtype in ("u1", "<u2", "<u4"):
+        if N <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype("<u8")
+
+
+def _npy_header(dtype, shape):
+    """Return a .npy (v1.0) header of exactly _NPY_HEADER_SIZE bytes"""
+    header = ("{'descr': '%s', 'fortran_order': False, 'shape': (%d, %d), }"
+              % (dtype.str, shape[0], shape[1]))
+    size = _NPY_HEADER_SIZE - 10
+    return (b"\x93NUMPY\x01\x00" + struct.pack("<H", size) +
+            header.ljust(size - 1).encode("ascii") + b"\n")
+
+
+def _seekable(out):
+    """Whether the file object supports seek and tell"""
+    try:
+        if hasattr(out, "seekable"):
+            return out.seekable()
+        out.tell()
+        return True
+    except (IOError, OSError, ValueError):
+        return False
+
+
+def write_solutions(solutions, N, out, fmt="line", number=None,
+                    batch_size=4096):
+    """
+    Write solutions to a binary file object, a batch at a time
+
+    Parameters
+    ----------
+    solutions : iterable of sequences of int
+        The solutions (state vectors) to write
+    N : int
+        The size of the board
+    out : binary file object
+        Where to write. In "npy" format, the header is rewritten at the
+        end if `out` is seekable; otherwise (a pipe...) the solutions are
+        held in memory until their number is known.
+    fmt : str in {"line", "raw", "npy"} (Default : "line")
+        "line" writes one solution per line, as space-separated rows;
+        "raw" writes the solutions as a C-ordered array of the smallest
+        unsigned type which fits N; "npy" does the same within a .npy
+        file whose shape is fixed once all the solutions are written
+    number : int or None (Default : None)
+        The maximum number of solutions to write (None for all)
+    batch_size : int (Default : 4096)
+        The number of solutions per write
+
+    Return
+    ------
+    nb : int
+        The number of solutions written
+    """
+    if fmt not in ("line", "raw", "npy"):
+        raise ValueError("Unknown format '%s'" % fmt)
+    solutions = iter(solutions)
+    if number is not None:
+        solutions = islice(solutions, number)
+    dtype = _solution_dtype(N)
+    held = None
+    if fmt == "npy":
+        if _seekable(out):
+            start = out.tell()
+            out.write(_npy_header(dtype, (0, N)))
+        else:
+            held = []
+    batch = np.empty((batch_size, N), dtype=dtype)
+    nb = 0
+    while True:
+        k = 0
+        if fmt == "line":
+            lines = [" ".join(map(str, B)) + "\n"
+                     for B in islice(solutions, batch_size)]
+            k = len(lines)
+            out.write("".join(lines).encode("ascii"))
+        else:
+            for B in islice(solutions, batch_size):
+                batch[k] = B
+                k += 1
+            if held is None:
+                out.write(batch[:k].tobytes())
+            else:
+                held.append(batch[:k].tobytes())
+        nb += k
+        if k < batch_size:
+            break
+    if held is not None:
+        out.write(_npy_header(dtype, (nb, N)))
+        for data in held:
+            out.write(data)
+    elif fmt == "npy":
+        end = out.tell()
+        out.seek(start)
+        out.write(_npy_header(dtype, (nb, N)))
+        out.seek(end)
+    return nb
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -105,20 +1365,54 @@ if __name__ == "__main__":
                         type=int,
                         help="The number of solution to print",
                         default=MAX_NB_SOLUTION) # TODO : do better
+    parser.add_argument("-f", "--format",
+                        choices=["board", "line", "raw", "npy", "count"],
+                        default="board",
+                        help="How to output the solutions: drawn boards, "
+                             "one per line, binary array (raw or .npy) "
+                             "or only their number")
+    parser.add_argument("-o", "--output",
+                        default="-",
+                        help="The file to write the solutions to "
+                             "(default: standard output)")
     args = parser.parse_args()
     N = args.N
     if args.slow:
         gen = queen
     else:
-        gen = queen_permut
-    
-    nb = 0
-    for board in gen(N):
-        print_queen(board)
-        print
-        nb+=1
-        if nb >= args.number:
-            break
+        gen = queen_bitmask
+
+    if args.format == "count":
+        if args.number != MAX_NB_SOLUTION:
+            nb = sum(1 for _ in islice(gen(N), args.number))
+        elif args.slow:
+            nb = sum(1 for _ in gen(N))
+        else:
+            nb = nb_solutions_bitmask(N)
+        print nb
+    elif args.format == "board":
+        nb = 0
+        for board in gen(N):
+            print_queen(board)
+            print
+            nb+=1
+            if nb >= args.number:
+                break
 
-    if args.number == MAX_NB_SOLUTION:
-        print "There are", nb, "solution for the", N, "- queens problem" 
\ No newline at end of file
+        if args.number == MAX_NB_SOLUTION:
+            print "There are", nb, "solution for the", N, "- queens problem"
+    else:
+        import io
+        buffer_size = 1 << 20
+        if args.output == "-":
+            out = io.open(sys.stdout.fileno(), "wb", buffer_size,
+                          closefd=False)
+        else:
+            out = io.open(args.output, "wb", buffer_size)
+        number = args.number
+        if number == MAX_NB_SOLUTION:
+            number = None
+        try:
+            write_solutions(gen(N), N, out, args.format, number)
+        finally:
+            out.close()
@@ -8,6 +8,7 @@ __copyright__ = "3-clause BSD License"
 __version__ = 'dev'
 
 
+import numpy
 from numpy.distutils.misc_util import Configuration
 
 
@@ -20,6 +21,11 @@ def configuration(parent_package="", top_path=None):
     config.add_subpackage('util')
     config.add_subpackage('test')
 
+    config.add_extension("_queens",
+                         sources=["_queens.c"],
+                         include_dirs=[numpy.get_include()],
+                         extra_compile_args=["-O3"])
+
     return config
 
 if __name__ == "__main__":
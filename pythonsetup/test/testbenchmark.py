@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+test benchmark
+"""
+
+__author__ = "Begon Jean-Michel <jm.begon@gmail.com>"
+__copyright__ = "3-clause BSD License"
+__version__ = 'dev'
+
+import os
+import shutil
+import tempfile
+import nose
+from main.benchmark import run_benchmark, compare, save_results
+from main.benchmark import load_results, time_solver
+from main import benchmark
+
+
+def test_benchmark():
+    """Test a small benchmark run and its persistence"""
+    records = run_benchmark(["bitmask", "queen_permut"], [4, 5, 10],
+                            repeat=2)
+    nose.tools.assert_equal([(r["solver"], r["N"], r["solutions"])
+                             for r in records],
+                            [("bitmask", 4, 2), ("bitmask", 5, 10),
+                             ("bitmask", 10, 724), ("queen_permut", 4, 2),
+                             ("queen_permut", 5, 10)])
+    nose.tools.assert_equal(len(records[0]["times"]), 2)
+    folder = tempfile.mkdtemp()
+    try:
+        path = os.path.join(folder, "results.json")
+        save_results(records, path)
+        nose.tools.assert_equal(load_results(path), records)
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_compare():
+    """Test the regression detection"""
+    baseline = [{"solver": "bitmask", "N": 8, "best": 1.0},
+                {"solver": "bitmask", "N": 9, "best": 1.0}]
+    records = [{"solver": "bitmask", "N": 8, "best": 1.1},
+               {"solver": "bitmask", "N": 9, "best": 1.5},
+               {"solver": "frontier", "N": 9, "best": 9.0}]
+    nose.tools.assert_equal(compare(records, baseline, 0.2),
+                            [("bitmask", 9, 1.0, 1.5)])
+
+
+def _failing(N):
+    raise MemoryError()
+
+
+def _killed(N):
+    os._exit(3)
+
+
+def test_failure():
+    """Test that a run dying without a result is reported"""
+    for solver in (_failing, _killed):
+        benchmark.SOLVERS["failing"] = (solver, 10)
+        try:
+            nose.tools.assert_raises(RuntimeError, time_solver, "failing",
+                                     4, 1)
+        finally:
+            del benchmark.SOLVERS["failing"]
@@ -7,10 +7,283 @@ __author__ = "Begon Jean-Michel <jm.begon@gmail.com>"
 __copyright__ = "3-clause BSD License"
 __version__ = 'dev'
 
+import io
+import os
+import random
+import shutil
+import tempfile
 import nose
-from main import nb_solutions 
+import numpy as np
+from itertools import islice, permutations, product
+from main import nb_solutions, nb_solutions_bitmask, nb_unique_solutions
+from main.queens import queen_permut, queen_bitmask, queen_orbits
+from main.queens import nb_solutions_parallel
+from main.queens import Board, check_queen, check_queens, queen
+from main.queens import write_solutions
+from main.queens import SolutionCache, cached_nb_solutions
+from main.queens import min_conflicts
+from main.queens import QueenPermutations, permutation_rank
+from main.queens import permutation_unrank, queen_batches
+from main.queens import nb_completions, queen_completions
+from main.queens import nb_solutions_frontier
+from main import queens
+
+
+def pure_python(check):
+    """Run `check` with the compiled extension disabled"""
+    def run(*args):
+        compiled = queens._queens
+        queens._queens = None
+        try:
+            check(*args)
+        finally:
+            queens._queens = compiled
+    return run
 
 def test_8_queens():
 	"""Test the number of solutions for 8 queens"""
 	nose.tools.assert_equal(nb_solutions(8), 92)
-	
\ No newline at end of file
+	
+def check_bitmask(N):
+    """Test the backtracking solver against the brute-force one"""
+    nose.tools.assert_equal(nb_solutions_bitmask(N), nb_solutions(N))
+    nose.tools.assert_equal(list(queen_bitmask(N)), list(queen_permut(N)))
+
+def test_bitmask():
+    for N in range(9):
+        yield check_bitmask, N
+        yield pure_python(check_bitmask), N
+
+def check_symmetry(N):
+    """Test the symmetry-reduced counting and the orbit expansion"""
+    nose.tools.assert_equal(nb_solutions_bitmask(N, symmetry=True),
+                            nb_solutions(N))
+    nose.tools.assert_equal(sorted(queen_orbits(N)), list(queen_permut(N)))
+
+def test_symmetry():
+    for N in range(9):
+        yield check_symmetry, N
+        yield pure_python(check_symmetry), N
+
+def test_unique_8_queens():
+    """Test the number of fundamental solutions for 8 queens"""
+    nose.tools.assert_equal(nb_unique_solutions(8), 12)
+
+def check_parallel(N):
+    """Test the multiprocess counting against the serial one"""
+    nose.tools.assert_equal(nb_solutions_parallel(N, n_jobs=2),
+                            nb_solutions(N))
+
+def test_parallel():
+    for N in range(9):
+        yield check_parallel, N
+        yield pure_python(check_parallel), N
+
+def check_slow(N):
+    """Test the N**N generator against the filtered configurations"""
+    expected = [B for B in product(range(N), repeat=N) if check_queen(B)]
+    nose.tools.assert_equal([tuple(B) for B in queen(N)], expected)
+
+def test_slow():
+    for N in range(7):
+        yield check_slow, N
+        yield pure_python(check_slow), N
+
+def test_board():
+    """Test :class:`Board`"""
+    board = Board(4)
+    board.place(0, 1)
+    board.place(1, 3)
+    nose.tools.assert_true(board.is_valid())
+    nose.tools.assert_false(board.is_safe(2, 2))
+    board.place(2, 2)
+    nose.tools.assert_false(board.is_valid())
+    board.move(2, 0)
+    board.place(3, 2)
+    nose.tools.assert_true(board.is_solved())
+    nose.tools.assert_equal(board.to_tuple(), (1, 3, 0, 2))
+    nose.tools.assert_equal(board.remove(3), 2)
+    nose.tools.assert_false(board.is_solved())
+    nose.tools.assert_raises(ValueError, board.place, 3, -1)
+    nose.tools.assert_raises(ValueError, board.place, 3, 4)
+    nose.tools.assert_raises(ValueError, board.place, -1, 0)
+    nose.tools.assert_raises(ValueError, board.place, 4, 0)
+    nose.tools.assert_raises(ValueError, board.remove, -1)
+    board.place(3, 2)
+    nose.tools.assert_true(board.is_solved())
+
+def check_check_queens():
+    """Test the batch validator against :func:`check_queen`"""
+    boards = np.array(list(product(range(5), repeat=5)))
+    expected = [check_queen(B) for B in boards]
+    nose.tools.assert_equal(list(check_queens(boards, chunk_size=7)),
+                            expected)
+    nose.tools.assert_equal(list(check_queens([[0, 5], [1, 3]])),
+                            [False, False])
+    for B in ([0, 4, 1, 3], [1, 3, 0, -2], [-1, 1, 3, 0]):
+        nose.tools.assert_false(check_queen(B))
+
+def test_check_queens():
+    yield check_check_queens,
+    yield pure_python(check_check_queens),
+
+def test_write_solutions():
+    """Test the bulk output formats"""
+    expected = list(queen_permut(6))
+    out = io.BytesIO()
+    nose.tools.assert_equal(write_solutions(queen_permut(6), 6, out), 4)
+    lines = out.getvalue().decode("ascii").splitlines()
+    nose.tools.assert_equal([tuple(map(int, l.split())) for l in lines],
+                            expected)
+    out = io.BytesIO()
+    write_solutions(queen_permut(6), 6, out, "raw", batch_size=3)
+    raw = np.frombuffer(out.getvalue(), dtype=np.uint8).reshape(-1, 6)
+    nose.tools.assert_equal([tuple(B) for B in raw], expected)
+    out = io.BytesIO()
+    write_solutions(queen_permut(8), 8, out, "npy", number=50, batch_size=7)
+    out.seek(0)
+    array = np.load(out)
+    nose.tools.assert_equal(array.shape, (50, 8))
+    nose.tools.assert_equal([tuple(B) for B in array],
+                            list(queen_permut(8))[:50])
+    out = _Pipe()
+    write_solutions(queen_permut(8), 8, out, "npy", batch_size=7)
+    array = np.load(io.BytesIO(out.getvalue()))
+    nose.tools.assert_equal([tuple(B) for B in array],
+                            list(queen_permut(8)))
+
+class _Pipe(io.BytesIO):
+    """A binary stream which cannot seek, as the standard output"""
+    def seekable(self):
+        return False
+
+    def seek(self, *args):
+        raise IOError("Illegal seek")
+
+    def tell(self):
+        raise IOError("Illegal seek")
+
+def test_cache():
+    """Test :class:`SolutionCache`"""
+    folder = tempfile.mkdtemp()
+    try:
+        path = os.path.join(folder, "cache.json")
+        cache = SolutionCache(path, max_entries=2)
+        nose.tools.assert_equal(cached_nb_solutions(8, cache=cache), 92)
+        nose.tools.assert_equal(len(cache), 0)
+        nose.tools.assert_equal(cached_nb_solutions(8, cache=cache,
+                                                    force=True), 92)
+        nose.tools.assert_equal(len(cache), 0)
+        cache.set(40, "bitmask", 1)
+        cache.set(41, "bitmask", 2)
+        cache.get(40, "bitmask")
+        cache.set(42, "bitmask", 3)
+        # 41 is the least recently used
+        cache = SolutionCache(path, max_entries=2)
+        nose.tools.assert_equal(cached_nb_solutions(40, cache=cache), 1)
+        nose.tools.assert_equal(cache.get(41, "bitmask"), None)
+        nose.tools.assert_equal(cache.get(42, "bitmask"), 3)
+        nose.tools.assert_equal(cache.get(42, "permut"), None)
+        nose.tools.assert_equal(os.listdir(folder), ["cache.json"])
+    finally:
+        shutil.rmtree(folder)
+
+def check_min_conflicts(N):
+    """Test the local search"""
+    B = min_conflicts(N, seed=N)
+    nose.tools.assert_equal(len(B), N)
+    nose.tools.assert_true(check_queen(B))
+
+def test_min_conflicts():
+    for N in (1, 4, 5, 6, 8, 50, 1000):
+        yield check_min_conflicts, N
+    nose.tools.assert_equal(min_conflicts(3), None)
+
+def test_permutation_rank():
+    """Test the ranking and unranking of permutations"""
+    for rank, P in enumerate(permutations(range(5))):
+        nose.tools.assert_equal(permutation_rank(P), rank)
+        nose.tools.assert_equal(tuple(permutation_unrank(5, rank)), P)
+
+def test_queen_permutations():
+    """Test the sharding and resuming of :class:`QueenPermutations`"""
+    expected = list(queen_permut(7))
+    nose.tools.assert_equal(list(QueenPermutations(7)), expected)
+    shards = []
+    for k in range(7):
+        shards.extend(QueenPermutations(7, k*720, (k+1)*720))
+    nose.tools.assert_equal(shards, expected)
+    enumerator = QueenPermutations(7, stop=3000)
+    first = list(islice(enumerator, 10))
+    rank = enumerator.rank
+    resumed = first + list(QueenPermutations(7, rank, 3000))
+    nose.tools.assert_equal(resumed, [B for B in expected
+                                      if permutation_rank(B) < 3000])
+
+def test_queen_batches():
+    """Test the blocks of solutions"""
+    expected = list(queen_permut(8))
+    blocks = list(queen_batches(8, batch_size=10, reuse=False))
+    nose.tools.assert_equal([b.shape[0] for b in blocks], [10]*9 + [2])
+    nose.tools.assert_equal([tuple(B) for b in blocks for B in b], expected)
+    solutions = [tuple(B) for b in queen_batches(8, batch_size=10)
+                 for B in b]
+    nose.tools.assert_equal(solutions, expected)
+
+def check_completions(partial):
+    """Test the completion solver against filtering all the solutions"""
+    expected = [B for B in queen_permut(len(partial))
+                if all(r is None or r == b for r, b in zip(partial, B))]
+    nose.tools.assert_equal(sorted(queen_completions(partial)), expected)
+    nose.tools.assert_equal(nb_completions(partial), len(expected))
+
+def test_completions():
+    for partial in ([None]*8, [None, 4, None, None, None, None, None, 2],
+                    [0, 4, 7, 5, None, None, 1, None], [0, 1] + [None]*6,
+                    [0, None, None, 0, None, None], [2] + [None]*7):
+        yield check_completions, partial
+
+def test_completions_large():
+    """Test the completion of a mostly free large board"""
+    N = 1201
+    # Rows 1, 3, 5, ... then 0, 2, 4, ... solve the boards with N % 6 == 1
+    solution = list(range(1, N, 2)) + list(range(0, N, 2))
+    partial = list(solution)
+    for i in random.Random(0).sample(range(N), 1001):
+        partial[i] = None
+    B = next(queen_completions(partial))
+    nose.tools.assert_true(check_queen(B))
+    nose.tools.assert_true(all(r is None or r == b
+                               for r, b in zip(partial, B)))
+
+def check_frontier(N, max_frontier):
+    """Test the breadth-first counting against the brute-force one"""
+    nose.tools.assert_equal(nb_solutions_frontier(N, max_frontier),
+                            nb_solutions(N))
+
+def test_frontier():
+    for N in range(9):
+        yield check_frontier, N, 1 << 20
+        yield check_frontier, N, 5
+    stats = []
+    nb_solutions_frontier(8, stats=stats)
+    nose.tools.assert_equal([size for _, size, _ in stats],
+                            [1, 8, 42, 140, 344, 568, 550, 312])
+
+def test_frontier_budget():
+    """Test that no level of the frontier exceeds its budget"""
+    sizes = []
+    expand = queens._expand_frontier
+    def recording(*args):
+        children = expand(*args)
+        sizes.append(len(children[0]))
+        return children
+    queens._expand_frontier = recording
+    try:
+        stats = []
+        nose.tools.assert_equal(nb_solutions_frontier(8, 20, stats), 92)
+    finally:
+        queens._expand_frontier = expand
+    nose.tools.assert_true(max(sizes) <= 20)
+    nose.tools.assert_equal([size for _, size, _ in stats],
+                            [1, 8, 42, 140, 344, 568, 550, 312])